@@ -11,18 +11,23 @@ __description__ = "Personal expense tracker with OCR receipt processing"
 
 # Package imports for easier access
 from .config import config
-from .database import DatabaseManager
+from .database import DatabaseManager, SqlitePool, ImageFileCache, BatchWriter
 from .ocr_processor import OCRProcessingService
 from .managers import ExpenseManager, DraftManager, CategoryManager
+from .schemas import ExpenseForm
 from .validators import validate_expense_data, validate_draft_data, validate_category_name
 
 __all__ = [
     "config",
     "DatabaseManager", 
+    "SqlitePool",
+    "ImageFileCache",
+    "BatchWriter",
     "OCRProcessingService",
     "ExpenseManager",
     "DraftManager", 
     "CategoryManager",
+    "ExpenseForm",
     "validate_expense_data",
     "validate_draft_data",
     "validate_category_name"
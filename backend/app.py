@@ -6,90 +6,252 @@ SCOPE: HTTP API layer and request/response handling
 DEPENDENCIES: FastAPI, all backend modules
 """
 
-import uuid
+import os
+import mmap
+import time
+import tempfile
+import asyncio
+import orjson
+import hashlib
 import logging
-import aiofiles
-from datetime import datetime
-from typing import List
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Response
-from fastapi.responses import HTMLResponse
+from uuid import uuid4
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import PositiveInt
 
 from .config import config
-from .database import DatabaseManager
+from .database import BatchWriter, DatabaseManager, SqlitePool, ImageFileCache, image_digest
 from .ocr_processor import OCRProcessingService
 from .managers import ExpenseManager, DraftManager, CategoryManager
-from .validators import validate_expense_data, sanitize_form_data
+from .rate_limit import TokenBucketLimiter
+from .schemas import BulkIds, ExpenseForm, as_form
+from .validators import validate_expense_data, sanitize_form_data, is_image_header, IMAGE_HEADER_SIZE
 
 logger = logging.getLogger(__name__)
 
-# Initialize FastAPI app
-app = FastAPI(title="Expense Tracker")
-app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
+# Initialize service instances (all managers share one connection pool)
+db_pool = SqlitePool(config.DB_FILE, readers=config.DB_READER_CONNECTIONS)
+db_manager = DatabaseManager(db_pool)
+image_cache = ImageFileCache(config.IMAGE_CACHE_DIR)
+expense_manager = ExpenseManager(db_pool, image_cache)
+draft_batch_writer = BatchWriter(db_pool)
+draft_manager = DraftManager(db_pool, draft_batch_writer, image_cache)
+category_manager = CategoryManager(db_pool)
+ocr_service = OCRProcessingService(db_pool)
+
+# Caps the number of OCR jobs in flight across all concurrent uploads
+OCR_SEMAPHORE = asyncio.Semaphore(config.OCR_MAX_CONCURRENCY)
+
+# Per-client budget of uploaded files, refilled continuously
+upload_limiter = TokenBucketLimiter(config.UPLOAD_FILES_PER_MINUTE, period=60.0)
+
+# Shared pool for blocking work (OCR, hashing); installed as the loop's default executor
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+# Readiness probe result, memoized so frequent probes don't each hit the database
+READY_CHECK_INTERVAL = 5.0
+_ready_checked_at = float('-inf')
+_ready_ok = False
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open and warm the database pool before serving requests; release it on shutdown."""
+    global _blocking_executor
+    _blocking_executor = ThreadPoolExecutor(
+        max_workers=config.EXECUTOR_MAX_WORKERS, thread_name_prefix="blocking"
+    )
+    asyncio.get_running_loop().set_default_executor(_blocking_executor)
+    
+    await db_pool.open()
+    await db_manager.initialize_database()
+    await db_pool.warmup()
+    logger.info("Database initialized successfully.")
+    _load_index_html()
+    
+    yield
+    
+    await draft_batch_writer.stop()
+    await ocr_service.aclose()
+    await db_pool.close()
+    _blocking_executor.shutdown(wait=False)
 
-# Initialize service instances
-db_manager = DatabaseManager(config.DB_FILE)
-expense_manager = ExpenseManager(config.DB_FILE)
-draft_manager = DraftManager(config.DB_FILE)
-category_manager = CategoryManager(config.DB_FILE)
-ocr_service = OCRProcessingService()
 
+class ImageBypassGZipMiddleware(GZipMiddleware):
+    """GZip responses except stored images, which are already compressed and served as files."""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/image"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the application on startup."""
-    await db_manager.initialize_database()
-    logger.info("Database initialized successfully.")
+
+# Initialize FastAPI app
+app = FastAPI(title="Expense Tracker", default_response_class=ORJSONResponse, lifespan=lifespan)
+app.add_middleware(ImageBypassGZipMiddleware, minimum_size=1024, compresslevel=5)
+app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
 
 
 # ============================================================================
 # FRONTEND ENDPOINTS
 # ============================================================================
 
-@app.get("/", response_class=HTMLResponse)
-async def serve_index():
-    """Serve the main HTML interface."""
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match header already names this ETag.
+    
+    Uses the weak comparison If-None-Match calls for, so a W/ prefix on either side is ignored.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
+
+
+def _image_cache_headers(etag: str) -> dict:
+    """Caching headers for stored images, which never change under a given hash."""
+    return {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+
+
+EXT_TO_MIME = {
+    'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp',
+    'gif': 'image/gif', 'bmp': 'image/bmp', 'tif': 'image/tiff', 'tiff': 'image/tiff',
+    'heic': 'image/heic', 'heif': 'image/heif',
+}
+
+
+def _image_media_type(filename: Optional[str]) -> str:
+    """Look up an image media type from the original filename's extension (JPEG if unknown)."""
+    ext = os.path.splitext(filename or '')[1][1:].lower()
+    return EXT_TO_MIME.get(ext, 'image/jpeg')
+
+
+def _load_index_html() -> None:
+    """Read the HTML interface once and keep it (with its ETag) on app.state."""
     try:
-        async with aiofiles.open('frontend/index.html', mode='r', encoding='utf-8') as f:
-            content = await f.read()
-        return HTMLResponse(content=content)
+        with open('frontend/index.html', 'rb') as f:
+            content = f.read()
     except FileNotFoundError:
+        app.state.index_html, app.state.index_etag = None, None
+        return
+    app.state.index_html = content
+    app.state.index_etag = f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+
+
+@app.get("/", response_class=HTMLResponse)
+async def serve_index(request: Request):
+    """Serve the main HTML interface from memory, honoring If-None-Match."""
+    content = getattr(app.state, 'index_html', None)
+    if content is None:
         return HTMLResponse(
             content="<h1>Expense Tracker</h1><p>Frontend file not found.</p>", 
             status_code=404
         )
+    
+    headers = {"ETag": app.state.index_etag, "Cache-Control": "public, max-age=60"}
+    if _etag_matches(request, app.state.index_etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=content, headers=headers)
 
 
 # ============================================================================
 # OCR AND IMAGE UPLOAD ENDPOINTS
 # ============================================================================
 
-@app.post("/upload-images")
-async def upload_images(files: List[UploadFile] = File(...)):
-    """Upload images, process with OCR, and save as drafts."""
-    upload_group_id = str(uuid.uuid4())
-    draft_ids = []
+async def _spool_upload(file: UploadFile) -> Optional[Tuple[tempfile.SpooledTemporaryFile, int]]:
+    """Copy an upload into a spooled temp file in fixed-size chunks.
     
-    for file in files:
-        if not file.content_type.startswith('image/'):
-            continue
-        
+    Returns None without reading further when the header is not a known image format.
+    """
+    header = await file.read(IMAGE_HEADER_SIZE)
+    if not is_image_header(header):
+        return None
+    
+    spool = tempfile.SpooledTemporaryFile(max_size=config.UPLOAD_SPOOL_MAX_SIZE)
+    spool.write(header)
+    size = len(header)
+    while chunk := await file.read(config.UPLOAD_CHUNK_SIZE):
+        spool.write(chunk)
+        size += len(chunk)
+    return spool, size
+
+
+def _image_buffer(spool: tempfile.SpooledTemporaryFile, size: int) -> Union[bytes, mmap.mmap]:
+    """Expose spooled image data, memory-mapping spools that rolled over to disk."""
+    spool.seek(0)
+    if size > config.UPLOAD_SPOOL_MAX_SIZE:
+        return mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+    return spool.read()
+
+
+async def _process_one(file: UploadFile, upload_group_id: str) -> List[int]:
+    """Run OCR on a single uploaded image and save its results as drafts."""
+    spooled = await _spool_upload(file)
+    if spooled is None:
+        logger.warning("Skipping %s: not a recognised image format", file.filename)
+        return []
+    
+    spool, size = spooled
+    with spool:
+        image_data = _image_buffer(spool, size)
         try:
-            image_bytes = await file.read()
-            parsed_results = await ocr_service.process_image(image_bytes)
+            async with OCR_SEMAPHORE:
+                parsed_results = await ocr_service.process_image(image_data)
             
             if not parsed_results:
-                logger.warning(f"Could not extract any data from {file.filename}")
-                continue
+                logger.warning("Could not extract any data from %s", file.filename)
+                return []
+            
+            image_sha256 = await asyncio.to_thread(image_digest, image_data)
+            return await draft_manager.save_drafts_bulk(
+                upload_group_id, parsed_results, image_data, file.filename, image_sha256
+            )
+        finally:
+            if isinstance(image_data, mmap.mmap):
+                image_data.close()
 
-            for data in parsed_results:
-                draft_id = await draft_manager.save_draft(
-                    upload_group_id, data, image_bytes, file.filename
-                )
-                draft_ids.append(draft_id)
-                
-        except Exception as e:
-            logger.error(f"Error processing {file.filename}: {e}")
+
+@app.post("/upload-images")
+async def upload_images(request: Request, files: List[UploadFile] = File(...)):
+    """Upload images, process with OCR concurrently, and save as drafts."""
+    if len(files) > config.UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=413, detail=f"At most {config.UPLOAD_MAX_FILES} files can be uploaded at once"
+        )
+    
+    client = request.client.host if request.client else 'unknown'
+    if not upload_limiter.consume(client, len(files)):
+        raise HTTPException(
+            status_code=429, detail="Upload rate limit exceeded, please try again later",
+            headers={"Retry-After": str(upload_limiter.retry_after(client, len(files)))}
+        )
+    
+    upload_group_id = str(uuid4())
+    image_files = [file for file in files if file.content_type.startswith('image/')]
+    
+    results = await asyncio.gather(
+        *(_process_one(file, upload_group_id) for file in image_files),
+        return_exceptions=True
+    )
+    
+    draft_ids = []
+    for file, result in zip(image_files, results):
+        if isinstance(result, BaseException):
+            logger.error("Error processing %s: %s", file.filename, result)
+            continue
+        draft_ids.extend(result)
 
     return {"upload_group_id": upload_group_id, "drafts_created": len(draft_ids)}
 
@@ -105,7 +267,7 @@ async def get_drafts():
 
 
 @app.get("/drafts/{draft_id}")
-async def get_draft(draft_id: int):
+async def get_draft(draft_id: PositiveInt):
     """Get full details for a single draft."""
     draft = await draft_manager.get_draft(draft_id)
     if not draft:
@@ -115,7 +277,7 @@ async def get_draft(draft_id: int):
 
 @app.put("/drafts/{draft_id}")
 async def update_draft(
-    draft_id: int,
+    draft_id: PositiveInt,
     date: str = Form(''),
     amount: float = Form(0),
     currency: str = Form('EUR'),
@@ -147,26 +309,11 @@ async def update_draft(
 
 
 @app.post("/drafts/{draft_id}/confirm")
-async def confirm_draft(
-    draft_id: int, 
-    date: str = Form(...), 
-    amount: float = Form(...), 
-    currency: str = Form(...), 
-    fx_rate: float = Form(...), 
-    amount_eur: float = Form(...), 
-    description: str = Form(...), 
-    category: str = Form(...), 
-    person: str = Form(...), 
-    beneficiary: str = Form('')
-):
+async def confirm_draft(draft_id: PositiveInt, form: ExpenseForm = Depends(as_form(ExpenseForm))):
     """Convert a draft to a permanent expense record with error handling."""
     try:
-        # Prepare expense data
-        expense_data = sanitize_form_data({
-            'date': date, 'amount': amount, 'currency': currency, 'fx_rate': fx_rate,
-            'amount_eur': amount_eur, 'description': description, 'category': category,
-            'person': person, 'beneficiary': beneficiary
-        })
+        # Prepare expense data (already stripped by the form model)
+        expense_data = form.model_dump()
         
         # Validate the data
         is_valid, validation_errors = validate_expense_data(expense_data)
@@ -185,11 +332,11 @@ async def confirm_draft(
         # Clear any previous error state
         await draft_manager.clear_draft_error(draft_id)
         
-        # Get image data from draft
-        img_data, img_fname = await draft_manager.get_draft_image(draft_id)
+        # Get the stored image reference from the draft
+        img_sha256, img_fname = await draft_manager.get_draft_image_ref(draft_id)
         
-        # Create the permanent expense
-        expense_id = await expense_manager.create_expense(expense_data, img_data, img_fname or '')
+        # Create the permanent expense (it shares the draft's stored image)
+        expense_id = await expense_manager.create_expense(expense_data, img_sha256, img_fname or '')
         
         # Clean up the draft only if successful
         await draft_manager.delete_draft(draft_id)
@@ -197,7 +344,7 @@ async def confirm_draft(
         return {"success": True, "id": expense_id}
         
     except Exception as e:
-        logger.error(f"Error confirming draft {draft_id}: {e}")
+        logger.error("Error confirming draft %s: %s", draft_id, e)
         # Mark draft with error instead of losing it
         await draft_manager.mark_draft_error(draft_id, f"System error: {str(e)}")
         return {
@@ -209,11 +356,8 @@ async def confirm_draft(
 
 
 @app.post("/drafts/bulk-confirm")
-async def bulk_confirm_drafts(draft_ids: List[int] = Form(...)):
+async def bulk_confirm_drafts(draft_ids: BulkIds = Form(...)):
     """Bulk confirm multiple drafts with partial success handling."""
-    if not draft_ids:
-        raise HTTPException(status_code=400, detail="No draft IDs provided")
-    
     results = {
         "success_count": 0,
         "error_count": 0,
@@ -222,10 +366,15 @@ async def bulk_confirm_drafts(draft_ids: List[int] = Form(...)):
         "error_ids": []
     }
     
+    # Fetch every requested draft in one query, then flush error/delete updates in batches
+    draft_ids = list(dict.fromkeys(draft_ids))
+    drafts = await draft_manager.get_drafts_many(draft_ids)
+    draft_errors = {}
+    confirmed = {}  # draft_id -> (expense_data, image_sha256, image_filename)
+    
     for draft_id in draft_ids:
         try:
-            # Get draft data
-            draft_data = await draft_manager.get_draft(draft_id)
+            draft_data = drafts.get(draft_id)
             if not draft_data:
                 results["error_count"] += 1
                 results["errors"].append(f"Draft {draft_id} not found")
@@ -250,40 +399,49 @@ async def bulk_confirm_drafts(draft_ids: List[int] = Form(...)):
             if not is_valid:
                 # Mark draft with error instead of failing
                 error_message = "; ".join(validation_errors)
-                await draft_manager.mark_draft_error(draft_id, error_message)
+                draft_errors[draft_id] = error_message
                 results["error_count"] += 1
                 results["errors"].append(f"Draft {draft_id}: {error_message}")
                 results["error_ids"].append(draft_id)
                 continue
             
-            # Clear any previous error state
-            await draft_manager.clear_draft_error(draft_id)
-            
-            # Get image data from draft
-            img_data, img_fname = await draft_manager.get_draft_image(draft_id)
-            
-            # Create the permanent expense
-            expense_id = await expense_manager.create_expense(expense_data, img_data, img_fname or '')
-            
-            # Clean up the draft only if successful
-            await draft_manager.delete_draft(draft_id)
-            
-            results["success_count"] += 1
-            results["success_ids"].append(draft_id)
+            # The permanent expense shares the draft's stored image
+            confirmed[draft_id] = (
+                expense_data, draft_data.get('image_sha256'), draft_data.get('image_filename') or ''
+            )
             
         except Exception as e:
-            logger.error(f"Error confirming draft {draft_id}: {e}")
+            logger.error("Error confirming draft %s: %s", draft_id, e)
             # Mark draft with error instead of losing it
-            await draft_manager.mark_draft_error(draft_id, f"System error: {str(e)}")
+            draft_errors[draft_id] = f"System error: {str(e)}"
             results["error_count"] += 1
             results["errors"].append(f"Draft {draft_id}: System error - {str(e)}")
             results["error_ids"].append(draft_id)
     
+    # Create the expenses and delete their drafts in one transaction; rows that fail keep their draft
+    try:
+        confirmed_ids, insert_errors = await expense_manager.confirm_drafts(confirmed)
+    except Exception as e:
+        logger.error("Error confirming drafts %s: %s", list(confirmed), e)
+        confirmed_ids, insert_errors = [], {draft_id: str(e) for draft_id in confirmed}
+    
+    results["success_count"] = len(confirmed_ids)
+    results["success_ids"] = confirmed_ids
+    for draft_id, error in insert_errors.items():
+        logger.error("Error confirming draft %s: %s", draft_id, error)
+        draft_errors[draft_id] = f"System error: {error}"
+        results["error_count"] += 1
+        results["errors"].append(f"Draft {draft_id}: System error - {error}")
+        results["error_ids"].append(draft_id)
+    
+    # Record failures
+    await draft_manager.mark_drafts_errors(draft_errors)
+    
     return results
 
 
 @app.post("/drafts/{draft_id}/clear-error")
-async def clear_draft_error(draft_id: int):
+async def clear_draft_error(draft_id: PositiveInt):
     """Clear error state from a draft."""
     success = await draft_manager.clear_draft_error(draft_id)
     if not success:
@@ -292,7 +450,7 @@ async def clear_draft_error(draft_id: int):
 
 
 @app.delete("/drafts/{draft_id}")
-async def delete_draft(draft_id: int):
+async def delete_draft(draft_id: PositiveInt):
     """Delete (dismiss) a draft."""
     success = await draft_manager.delete_draft(draft_id)
     if not success:
@@ -301,29 +459,51 @@ async def delete_draft(draft_id: int):
 
 
 @app.get("/drafts/{draft_id}/image")
-async def get_draft_image(draft_id: int):
+async def get_draft_image(draft_id: PositiveInt, request: Request):
     """Get the image associated with a draft."""
-    image_data, filename = await draft_manager.get_draft_image(draft_id)
-    if not image_data:
+    image_sha256, filename = await draft_manager.get_draft_image_ref(draft_id)
+    if not image_sha256:
         raise HTTPException(status_code=404, detail="Image not found for this draft")
     
-    # Fix: Complete the truncated line
-    ext = (filename.lower().split('.')[-1] if filename and '.' in filename else 'jpeg')
-    return Response(content=image_data, media_type=f'image/{ext}')
+    etag = f'"{image_sha256}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_image_cache_headers(etag))
+    
+    async def load() -> Optional[bytes]:
+        return (await draft_manager.get_draft_image(draft_id))[0]
+    
+    path = await image_cache.path_for(image_sha256, load)
+    if not path:
+        raise HTTPException(status_code=404, detail="Image not found for this draft")
+    
+    return FileResponse(path, media_type=_image_media_type(filename), headers=_image_cache_headers(etag))
 
 
 # ============================================================================
 # EXPENSE MANAGEMENT ENDPOINTS
 # ============================================================================
 
+async def _stream_expenses(first_page: List[dict], pages: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    """Encode pages of expenses as one JSON array, with a single orjson call per page."""
+    yield b'['
+    if first_page:
+        yield orjson.dumps(first_page)[1:-1]
+        async for page in pages:
+            yield b',' + orjson.dumps(page)[1:-1]
+    yield b']'
+
+
 @app.get("/expenses")
 async def get_expenses():
-    """Get all expenses."""
-    return await expense_manager.get_all_expenses()
+    """Get all expenses, streamed as a JSON array one page at a time."""
+    pages = expense_manager.iter_expense_pages()
+    # The first page is read before responding, so a failing database still gives a 500
+    first_page = await anext(pages, [])
+    return StreamingResponse(_stream_expenses(first_page, pages), media_type="application/json")
 
 
 @app.get("/expense/{expense_id}")
-async def get_expense(expense_id: int):
+async def get_expense(expense_id: PositiveInt):
     """Get a specific expense by ID."""
     expense = await expense_manager.get_expense(expense_id)
     if not expense:
@@ -332,24 +512,9 @@ async def get_expense(expense_id: int):
 
 
 @app.put("/expense/{expense_id}")
-async def update_expense(
-    expense_id: int, 
-    date: str = Form(...), 
-    amount: float = Form(...), 
-    currency: str = Form(...), 
-    fx_rate: float = Form(...), 
-    amount_eur: float = Form(...), 
-    description: str = Form(...), 
-    category: str = Form(...), 
-    person: str = Form(...), 
-    beneficiary: str = Form('')
-):
+async def update_expense(expense_id: PositiveInt, form: ExpenseForm = Depends(as_form(ExpenseForm))):
     """Update an existing expense."""
-    expense_data = sanitize_form_data({
-        'date': date, 'amount': amount, 'currency': currency, 'fx_rate': fx_rate,
-        'amount_eur': amount_eur, 'description': description, 'category': category,
-        'person': person, 'beneficiary': beneficiary
-    })
+    expense_data = form.model_dump()
     
     # Validate the data
     is_valid, validation_errors = validate_expense_data(expense_data)
@@ -364,7 +529,7 @@ async def update_expense(
 
 
 @app.delete("/expense/{expense_id}")
-async def delete_expense(expense_id: int):
+async def delete_expense(expense_id: PositiveInt):
     """Delete a specific expense."""
     success = await expense_manager.delete_expense(expense_id)
     if not success:
@@ -374,11 +539,8 @@ async def delete_expense(expense_id: int):
 
 
 @app.delete("/expenses/bulk")
-async def bulk_delete_expenses(expense_ids: List[int] = Form(...)):
+async def bulk_delete_expenses(expense_ids: BulkIds = Form(...)):
     """Delete multiple expenses at once."""
-    if not expense_ids:
-        raise HTTPException(status_code=400, detail="No expense IDs provided")
-    
     deleted_count = await expense_manager.bulk_delete_expenses(expense_ids)
     if deleted_count == 0:
         raise HTTPException(status_code=404, detail="No expenses found with the provided IDs")
@@ -387,21 +549,31 @@ async def bulk_delete_expenses(expense_ids: List[int] = Form(...)):
 
 
 @app.get("/expense/{expense_id}/audit")
-async def get_expense_audit_history_endpoint(expense_id: int):
+async def get_expense_audit_history_endpoint(expense_id: PositiveInt):
     """Get audit history for a specific expense."""
     audit_history = await expense_manager.get_expense_audit_history(expense_id)
     return {"success": True, "expense_id": expense_id, "audit_history": audit_history}
 
 
 @app.get("/expense/{expense_id}/image")
-async def get_expense_image(expense_id: int):
+async def get_expense_image(expense_id: PositiveInt, request: Request):
     """Get the image associated with an expense."""
-    image_data, filename = await expense_manager.get_expense_image(expense_id)
-    if not image_data:
+    image_sha256, filename = await expense_manager.get_expense_image_ref(expense_id)
+    if not image_sha256:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    ext = (filename.lower().split('.')[-1] if filename and '.' in filename else 'jpeg')
-    return Response(content=image_data, media_type=f'image/{ext}')
+    etag = f'"{image_sha256}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_image_cache_headers(etag))
+    
+    async def load() -> Optional[bytes]:
+        return (await expense_manager.get_expense_image(expense_id))[0]
+    
+    path = await image_cache.path_for(image_sha256, load)
+    if not path:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    return FileResponse(path, media_type=_image_media_type(filename), headers=_image_cache_headers(etag))
 
 
 # ============================================================================
@@ -409,9 +581,13 @@ async def get_expense_image(expense_id: int):
 # ============================================================================
 
 @app.get("/categories")
-async def get_categories():
-    """Get all available expense categories."""
-    return await category_manager.get_all_categories()
+async def get_categories(request: Request):
+    """Get all available expense categories (cached in-process, revalidated by ETag)."""
+    categories, etag = await category_manager.get_categories_with_etag()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(categories, headers=headers)
 
 
 @app.post("/add-category")
@@ -439,10 +615,49 @@ async def get_fx_rate_endpoint(currency: str, date: str = Query(None)):
     }
 
 
+async def _is_ready() -> bool:
+    """Check database availability, reusing the last result for a few seconds."""
+    global _ready_checked_at, _ready_ok
+    now = time.monotonic()
+    if now - _ready_checked_at < READY_CHECK_INTERVAL:
+        return _ready_ok
+    
+    try:
+        await asyncio.wait_for(db_pool.ping(), timeout=2.0)
+        _ready_ok = True
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        _ready_ok = False
+    _ready_checked_at = now
+    return _ready_ok
+
+
+@app.get("/livez")
+async def livez():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness probe: the database answers queries."""
+    if not await _is_ready():
+        return ORJSONResponse({"status": "unavailable"}, status_code=503)
+    return {"status": "ready"}
+
+
 @app.get("/health")
-async def health_check():
-    """Health check endpoint for monitoring."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+async def health_check(ts: Optional[str] = Query(None)):
+    """Health check endpoint for monitoring (readiness, kept for existing probes).
+    
+    timestamp is integer epoch seconds; pass ?ts=iso to get it as an ISO 8601 string instead.
+    """
+    now = time.time()
+    timestamp = datetime.fromtimestamp(now, tz=timezone.utc).isoformat() if ts == 'iso' else int(now)
+    body = {"status": "healthy" if await _is_ready() else "unhealthy", "timestamp": timestamp}
+    if body["status"] != "healthy":
+        return ORJSONResponse(body, status_code=503)
+    return body
 
 
 # ============================================================================
@@ -451,4 +666,14 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    
+    if os.getenv("DEV") == "1":
+        # Auto-reload for development: default event loop, single process
+        uvicorn.run("backend.app:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # Each worker is a separate process with its own DB pool and caches
+        uvicorn.run(
+            "backend.app:app", host="0.0.0.0", port=8000,
+            loop="uvloop", http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+        )
\ No newline at end of file
@@ -6,32 +6,46 @@ SCOPE: Application settings, constants, and environment variables
 DEPENDENCIES: None (foundational module)
 """
 
+import os
 import logging
 from dataclasses import dataclass
-from typing import List, Dict
+from types import MappingProxyType
+from typing import ClassVar, Mapping, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
-    """Application configuration constants."""
+    """Application configuration constants (immutable once created)."""
     DB_FILE: str = 'expenses.db'
-    DEFAULT_CATEGORIES: List[str] = None
-    FALLBACK_FX_RATES: Dict[str, float] = None
-    
-    def __post_init__(self):
-        if self.DEFAULT_CATEGORIES is None:
-            self.DEFAULT_CATEGORIES = [
-                'Other', 'Caffeine', 'Household', 'Car', 'Snacks',
-                'Office Lunch', 'Brunch', 'Clothing', 'Dog', 'Eating Out', 
-                'Groceries', 'Restaurants'
-            ]
-        if self.FALLBACK_FX_RATES is None:
-            self.FALLBACK_FX_RATES = {'USD': 1.08, 'HUF': 400.0}
+    DB_READER_CONNECTIONS: int = 4
+    OCR_MAX_CONCURRENCY: int = 4
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_SPOOL_MAX_SIZE: int = 1024 * 1024
+    IMAGE_CACHE_DIR: str = 'image_cache'
+    IMAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    UPLOAD_MAX_FILES: int = 20
+    UPLOAD_FILES_PER_MINUTE: int = 60
+    BULK_MAX_IDS: int = 1000
+    CATEGORY_CACHE_TTL: float = 60.0
+    FX_CACHE_TTL_TODAY: float = 300.0
+    FX_CACHE_TTL_HISTORICAL: float = 3600.0
+    EXECUTOR_MAX_WORKERS: int = min(32, (os.cpu_count() or 1) + 4)
+    DEFAULT_CATEGORIES: ClassVar[Tuple[str, ...]] = (
+        'Other', 'Caffeine', 'Household', 'Car', 'Snacks',
+        'Office Lunch', 'Brunch', 'Clothing', 'Dog', 'Eating Out', 
+        'Groceries', 'Restaurants'
+    )
+    FALLBACK_FX_RATES: ClassVar[Mapping[str, float]] = MappingProxyType({'USD': 1.08, 'HUF': 400.0})
 
 
 # Global configuration instance
 config = AppConfig()
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging: one plain stream handler on the root logger (unless the host already configured one)
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:%(message)s'))
+    _root_logger.addHandler(_handler)
+    _root_logger.setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
\ No newline at end of file
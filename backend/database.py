@@ -6,93 +6,466 @@ SCOPE: SQLite operations, schema versioning, and data persistence
 DEPENDENCIES: aiosqlite, config.py
 """
 
+import os
+import re
+import time
+import uuid
+import asyncio
+import hashlib
 import sqlite3
 import aiosqlite
 import logging
-from datetime import datetime
-from typing import List
+import threading
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Columns copied from a pre-version-1 expenses table, in insert order
+MIGRATED_EXPENSE_COLUMNS = (
+    'id', 'date', 'amount', 'currency', 'fx_rate', 'amount_eur',
+    'description', 'category', 'person', 'beneficiary', 'image_data',
+    'image_filename', 'created_at',
+)
+
+# Fallback SQL for migrated columns that are missing or NULL (columns without one are required)
+EXPENSE_MIGRATION_DEFAULTS = {
+    'currency': "'EUR'",
+    'fx_rate': '1.0',
+    'amount_eur': 'amount',
+    'description': "'Imported Expense'",
+    'category': "'Other'",
+    'person': "''",
+    'beneficiary': "''",
+    'image_data': 'NULL',
+    'image_filename': "''",
+    'created_at': 'CURRENT_TIMESTAMP',
+}
+
+
+def image_digest(image_data: Union[bytes, memoryview]) -> str:
+    """Content address (hex SHA-256) under which an image is stored."""
+    return hashlib.sha256(image_data).hexdigest()
+
+
+class ImageFileCache:
+    """On-disk copies of stored images, named by content hash, so they can be sent as files.
+    
+    Least recently used files are deleted once the directory grows past max_bytes, and a file
+    is dropped as soon as its image row is pruned; the images table stays the source of truth.
+    Files used in the last IN_USE_SECONDS are never deleted, so a path handed to a response
+    is still there when the response opens it.
+    """
+    
+    _DIGEST_RE = re.compile(r'[0-9a-f]{64}')
+    IN_USE_SECONDS = 60.0
+    
+    def __init__(self, directory: str, max_bytes: int = config.IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()  # orders touches against deletes across worker threads
+    
+    async def path_for(self, digest: str, load: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[str]:
+        """Return the cached file for a digest, writing it from `load()` on first use."""
+        if not self._DIGEST_RE.fullmatch(digest):
+            return None
+        
+        path = os.path.join(self.directory, digest)
+        if await asyncio.to_thread(self._touch, path):
+            return path
+        
+        image_data = await load()
+        if not image_data:
+            return None
+        await asyncio.to_thread(self._write, path, image_data)
+        return path
+    
+    async def discard(self, digests: List[str]) -> None:
+        """Drop cached files for images that were pruned from the database."""
+        if digests:
+            await asyncio.to_thread(self._discard, digests)
+    
+    def _touch(self, path: str) -> bool:
+        """Mark a cached file as recently used; False if it isn't cached."""
+        with self._lock:
+            try:
+                os.utime(path)
+                return True
+            except FileNotFoundError:
+                return False
+    
+    def _discard(self, digests: List[str]) -> None:
+        """Delete the cached files for the given digests."""
+        for digest in digests:
+            if self._DIGEST_RE.fullmatch(digest):
+                self._remove_if_idle(os.path.join(self.directory, digest))
+    
+    def _remove_if_idle(self, path: str) -> bool:
+        """Delete a cached file unless it was used recently; True if it is gone."""
+        with self._lock:
+            try:
+                if time.time() - os.stat(path).st_mtime < self.IN_USE_SECONDS:
+                    return False
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return True
+    
+    def _write(self, path: str, image_data: bytes) -> None:
+        """Write atomically so concurrent readers never see a partial file, then trim the cache."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(image_data)
+        with self._lock:
+            os.replace(tmp_path, path)
+        self._trim()
+    
+    def _trim(self) -> None:
+        """Delete the least recently used idle files until the cache fits in max_bytes."""
+        entries, total = [], 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not self._DIGEST_RE.fullmatch(entry.name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self._remove_if_idle(path):
+                total -= size
+
+
+class SqlitePool:
+    """Shared aiosqlite connections: one serialized writer plus a queue of readers."""
+    
+    PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA cache_size=-64000',
+        'PRAGMA mmap_size=268435456',
+        'PRAGMA busy_timeout=5000',
+    )
+    
+    def __init__(self, db_file: str, readers: int = 4):
+        self.db_file = db_file
+        self.reader_count = readers
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._connections: List[aiosqlite.Connection] = []
+    
+    async def open(self) -> None:
+        """Open the writer and reader connections (idempotent)."""
+        if self._writer is not None:
+            return
+        self._writer = await self._connect()
+        for _ in range(self.reader_count):
+            self._readers.put_nowait(await self._connect())
+    
+    async def warmup(self) -> None:
+        """Load the schema on every reader so the first requests don't pay for it."""
+        readers = [await self._readers.get() for _ in range(self.reader_count)]
+        try:
+            for conn in readers:
+                # Step the statement to completion so no read snapshot stays open
+                async with conn.execute('SELECT count(*) FROM sqlite_master') as cursor:
+                    await cursor.fetchone()
+        finally:
+            for conn in readers:
+                self._readers.put_nowait(conn)
+    
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        for conn in self._connections:
+            await conn.close()
+        self._connections.clear()
+        self._readers = asyncio.Queue()
+        self._writer = None
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection configured for WAL mode and named row access."""
+        conn = await aiosqlite.connect(self.db_file)
+        conn.row_factory = aiosqlite.Row
+        # One script, one hop to the connection thread for all settings
+        await conn.executescript(';\n'.join(self.PRAGMAS))
+        self._connections.append(conn)
+        return conn
+    
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool."""
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+    
+    async def ping(self) -> None:
+        """Run a trivial query on a reader connection (raises if the database is unusable)."""
+        async with self.reader() as conn:
+            async with conn.execute('SELECT 1') as cursor:
+                await cursor.fetchone()
+    
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the single write connection; uncommitted work is rolled back on error."""
+        async with self._write_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                if self._writer.in_transaction:
+                    try:
+                        await self._writer.rollback()
+                    except Exception as e:
+                        # Don't let a failed rollback mask the original error
+                        logger.error("Rollback after failed write raised: %s", e)
+                raise
+
+
+class BatchWriter:
+    """Group commit: write jobs queued while the writer is busy share one transaction.
+    
+    Each job runs inside its own SAVEPOINT, so a failing job is rolled back alone and
+    only its caller sees the error. Jobs must not commit.
+    """
+    
+    def __init__(self, pool: SqlitePool, max_batch: int = 64):
+        self.pool = pool
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def submit(self, job: Callable[[aiosqlite.Connection], Awaitable[Any]]) -> Any:
+        """Queue a write job and wait for the commit that includes it; returns the job's result."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return await future
+    
+    async def stop(self) -> None:
+        """Stop the drain task and fail any jobs still waiting in the queue."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("BatchWriter stopped"))
+    
+    async def _run(self) -> None:
+        """Drain whatever has queued up (up to max_batch) and commit it together."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._commit(batch)
+    
+    async def _commit(self, batch: List[Tuple[Callable, asyncio.Future]]) -> None:
+        """Run one batch of jobs in a single IMMEDIATE transaction."""
+        outcomes = []
+        try:
+            async with self.pool.writer() as conn:
+                await conn.execute('BEGIN IMMEDIATE')
+                for job, future in batch:
+                    await conn.execute('SAVEPOINT batch_job')
+                    try:
+                        result = await job(conn)
+                    except Exception as e:
+                        await conn.execute('ROLLBACK TO batch_job')
+                        await conn.execute('RELEASE batch_job')
+                        outcomes.append((future, e, None))
+                    else:
+                        await conn.execute('RELEASE batch_job')
+                        outcomes.append((future, None, result))
+                await conn.commit()
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e if isinstance(e, Exception) else RuntimeError("Batch write aborted"))
+            if not isinstance(e, Exception):
+                raise
+            logger.error("Batch write failed: %s", e)
+            return
+        
+        for future, error, result in outcomes:
+            if future.done():
+                continue  # Caller went away
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
 
 class DatabaseManager:
     """Handles all database operations and migrations."""
     
-    def __init__(self, db_file: str):
-        self.db_file = db_file
+    # Schema version after all migrations; stored in PRAGMA user_version
+    SCHEMA_VERSION = 3
+    
+    # Columns added to drafts by the version 2 migration
+    DRAFT_ERROR_COLUMNS = {
+        'has_error': 'INTEGER DEFAULT 0',
+        'error_message': 'TEXT DEFAULT NULL',
+        'last_error_at': 'TIMESTAMP DEFAULT NULL',
+    }
+    
+    def __init__(self, pool: SqlitePool):
+        self.pool = pool
+        self._columns: Dict[str, FrozenSet[str]] = {}
+    
+    async def _table_columns(self, conn: aiosqlite.Connection, table: str) -> FrozenSet[str]:
+        """Column names of a table (empty if it doesn't exist), memoized until its schema changes."""
+        if table not in self._columns:
+            cursor = await conn.execute(f"PRAGMA table_info({table})")
+            self._columns[table] = frozenset(row[1] for row in await cursor.fetchall())
+        return self._columns[table]
+    
+    async def _add_columns(self, conn: aiosqlite.Connection, table: str, definitions: Dict[str, str]) -> None:
+        """Add whichever of the given columns the table is missing."""
+        columns = await self._table_columns(conn, table)
+        for name, ddl in definitions.items():
+            if name not in columns:
+                await conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}')
+        self._columns.pop(table, None)
     
     async def initialize_database(self) -> None:
-        """Initialize SQLite database with proper schema and migrations."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            await self._setup_schema_versioning(conn)
+        """Initialize SQLite database with proper schema and migrations.
+        
+        Everything up to the commit runs in one IMMEDIATE transaction, so DDL is not
+        autocommitted piecemeal and a concurrently starting worker waits for the finished schema.
+        A database already stamped with SCHEMA_VERSION is left alone, so schema changes
+        (including new indexes) must come with a version bump.
+        """
+        async with self.pool.writer() as conn:
+            async with conn.execute('PRAGMA user_version') as cursor:
+                if (await cursor.fetchone())[0] >= self.SCHEMA_VERSION:
+                    logger.info("Database schema is current (version %s)", self.SCHEMA_VERSION)
+                    return
+            
+            await conn.execute('BEGIN IMMEDIATE')
             current_version = await self._get_current_schema_version(conn)
-            logger.info(f"Current database schema version: {current_version}")
+            logger.info("Current database schema version: %s", current_version)
             
+            if current_version < 1:
+                await self._migrate_to_version_1(conn)
             if current_version < 2:
-                if current_version < 1:
-                    await self._migrate_to_version_1(conn)
                 await self._migrate_to_version_2(conn)
+            if current_version < 3:
+                await self._migrate_to_version_3(conn)
+            if current_version < self.SCHEMA_VERSION:
+                await conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
             
             await self._create_supporting_tables(conn)
+            await self._create_indexes(conn)
             await self._insert_default_categories(conn)
             await conn.commit()
-    
-    async def _setup_schema_versioning(self, conn: aiosqlite.Connection) -> None:
-        """Set up schema version tracking table."""
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS schema_version (
-                version INTEGER PRIMARY KEY,
-                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+            
+            if current_version < self.SCHEMA_VERSION:
+                # Migrations rebuild tables and move inline images out; reclaim the freed pages
+                await conn.execute('VACUUM')
+            
+            # Refresh planner statistics so the indexes above are used
+            await conn.execute('ANALYZE')
+            await conn.commit()
     
     async def _get_current_schema_version(self, conn: aiosqlite.Connection) -> int:
-        """Get the current database schema version."""
-        cursor = await conn.execute('SELECT MAX(version) FROM schema_version')
-        result = await cursor.fetchone()
-        return result[0] or 0
+        """Get the current database schema version from the file header.
+        
+        Databases versioned before user_version was used still carry a schema_version table; it is read once.
+        """
+        async with conn.execute('PRAGMA user_version') as cursor:
+            version = (await cursor.fetchone())[0]
+        if version == 0 and await self._table_columns(conn, 'schema_version'):
+            async with conn.execute('SELECT MAX(version) FROM schema_version') as cursor:
+                version = (await cursor.fetchone())[0] or 0
+        return version
     
     async def _migrate_to_version_1(self, conn: aiosqlite.Connection) -> None:
         """Migrate database to version 1 with audit columns."""
         logger.info("Migrating to schema version 1: Adding audit columns")
         
-        # Create backup of existing expenses table
-        await self._create_backup_table(conn)
-        
-        # Create new expenses table with audit columns
-        await self._create_expenses_table_v1(conn)
-        
-        # Migrate existing data if old table exists
-        await self._migrate_existing_expense_data(conn)
+        if (await self._table_columns(conn, 'expenses')).issuperset(MIGRATED_EXPENSE_COLUMNS):
+            # Only the audit columns are new: add them in place instead of copying every row
+            await self._add_expense_audit_columns(conn)
+        else:
+            # Create backup of existing expenses table
+            await self._create_backup_table(conn)
+            
+            # Create new expenses table with audit columns
+            await self._create_expenses_table_v1(conn)
+            
+            # Migrate existing data if old table exists
+            await self._migrate_existing_expense_data(conn)
         
         # Create audit log table
         await self._create_audit_log_table(conn)
         
-        # Record schema version
-        await conn.execute('INSERT INTO schema_version (version) VALUES (1)')
         logger.info("Schema migration to version 1 completed")
     
     async def _migrate_to_version_2(self, conn: aiosqlite.Connection) -> None:
         """Migrate database to version 2 with error handling for drafts."""
         logger.info("Migrating to schema version 2: Adding error handling to drafts")
         
-        # Check if drafts table exists and has error columns
-        cursor = await conn.execute("PRAGMA table_info(drafts)")
-        columns = [row[1] for row in await cursor.fetchall()]
+        # A missing drafts table is created later with these columns already in place
+        columns = await self._table_columns(conn, 'drafts')
+        if columns and not columns.issuperset(self.DRAFT_ERROR_COLUMNS):
+            await self._add_columns(conn, 'drafts', self.DRAFT_ERROR_COLUMNS)
         
-        if 'has_error' not in columns:
-            await conn.execute('ALTER TABLE drafts ADD COLUMN has_error INTEGER DEFAULT 0')
-        if 'error_message' not in columns:
-            await conn.execute('ALTER TABLE drafts ADD COLUMN error_message TEXT DEFAULT NULL')
-        if 'last_error_at' not in columns:
-            await conn.execute('ALTER TABLE drafts ADD COLUMN last_error_at TIMESTAMP DEFAULT NULL')
-            
-        # Record schema version
-        await conn.execute('INSERT OR REPLACE INTO schema_version (version) VALUES (2)')
         logger.info("Schema migration to version 2 completed")
     
+    async def _migrate_to_version_3(self, conn: aiosqlite.Connection) -> None:
+        """Migrate database to version 3 with content-addressed image storage."""
+        logger.info("Migrating to schema version 3: Moving images into content-addressed storage")
+        
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS images (
+                sha256 TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                filename TEXT DEFAULT ''
+            )
+        ''')
+        
+        for table in ('expenses', 'drafts'):
+            if not await self._table_columns(conn, table):
+                continue  # Table is created later with the column already in place
+            await self._add_columns(conn, table, {'image_sha256': 'TEXT DEFAULT NULL'})
+            await self._move_inline_images(conn, table)
+        
+        logger.info("Schema migration to version 3 completed")
+    
+    async def _move_inline_images(self, conn: aiosqlite.Connection, table: str) -> None:
+        """Move inline image BLOBs of a table into the shared images table."""
+        cursor = await conn.execute(f'SELECT id FROM {table} WHERE image_data IS NOT NULL')
+        row_ids = [row[0] for row in await cursor.fetchall()]
+        
+        for row_id in row_ids:
+            cursor = await conn.execute(f'SELECT image_data, image_filename FROM {table} WHERE id = ?', (row_id,))
+            image_data, filename = await cursor.fetchone()
+            digest = image_digest(image_data)
+            await conn.execute(
+                'INSERT OR IGNORE INTO images (sha256, data, filename) VALUES (?, ?, ?)',
+                (digest, image_data, filename or '')
+            )
+            await conn.execute(
+                f'UPDATE {table} SET image_sha256 = ?, image_data = NULL WHERE id = ?', (digest, row_id)
+            )
+        
+        if row_ids:
+            logger.info("Moved %s inline images from %s into image storage", len(row_ids), table)
+    
     async def _create_backup_table(self, conn: aiosqlite.Connection) -> None:
         """Create backup of existing expenses table."""
         await conn.execute('DROP TABLE IF EXISTS expenses_backup_v1')
@@ -101,6 +474,26 @@ class DatabaseManager:
             await conn.execute('CREATE TABLE expenses_backup_v1 AS SELECT * FROM expenses')
             logger.info("Created backup of existing expenses table")
     
+    async def _add_expense_audit_columns(self, conn: aiosqlite.Connection) -> None:
+        """Add created_on/modified_on to an otherwise current expenses table, seeded from created_at.
+        
+        NULLs in the legacy columns get the same defaults the table rebuild applies.
+        """
+        await self._add_columns(conn, 'expenses', {
+            'created_on': 'TIMESTAMP DEFAULT NULL',
+            'modified_on': 'TIMESTAMP DEFAULT NULL',
+        })
+        defaults = ''.join(
+            f',\n                {column} = COALESCE({column}, {default})'
+            for column, default in EXPENSE_MIGRATION_DEFAULTS.items() if default != 'NULL'
+        )
+        await conn.execute(f'''
+            UPDATE expenses
+            SET created_on = COALESCE(created_on, created_at, CURRENT_TIMESTAMP),
+                modified_on = COALESCE(modified_on, created_at, CURRENT_TIMESTAMP){defaults}
+        ''')
+        logger.info("Added audit columns to existing expenses table")
+    
     async def _create_expenses_table_v1(self, conn: aiosqlite.Connection) -> None:
         """Create the main expenses table with all required columns."""
         await conn.execute('''
@@ -136,62 +529,39 @@ class DatabaseManager:
             await conn.execute('ALTER TABLE expenses_new RENAME TO expenses')
             
         except Exception as e:
-            logger.error(f"Error during migration: {e}")
+            logger.error("Error during migration: %s", e)
             await self._create_fresh_expenses_table(conn)
+        
+        self._columns.pop('expenses', None)
     
     async def _perform_data_migration(self, conn: aiosqlite.Connection) -> None:
         """Perform the actual data migration with proper column mapping."""
-        # Get column info from old table
-        cursor = await conn.execute("PRAGMA table_info(expenses)")
-        old_columns = [row[1] for row in await cursor.fetchall()]
-        
-        # Build migration query with proper column mapping
-        current_timestamp = datetime.now().isoformat()
-        base_columns = [
-            'id', 'date', 'amount', 'currency', 'fx_rate', 'amount_eur', 
-            'description', 'category', 'person', 'beneficiary', 'image_data', 
-            'image_filename', 'created_at'
-        ]
-        
-        select_parts = []
-        for col in base_columns:
-            if col in old_columns:
-                select_parts.append(col)
-            elif col == 'amount_eur':
-                select_parts.append('COALESCE(amount_eur, amount) as amount_eur')
-            elif col == 'fx_rate':
-                select_parts.append('COALESCE(fx_rate, 1.0) as fx_rate')
-            elif col == 'description':
-                select_parts.append('COALESCE(description, "Imported Expense") as description')
-            elif col == 'category':
-                select_parts.append('COALESCE(category, "Other") as category')
-            elif col == 'person':
-                select_parts.append('COALESCE(person, "") as person')
-            elif col == 'beneficiary':
-                select_parts.append('COALESCE(beneficiary, "") as beneficiary')
-            elif col == 'image_filename':
-                select_parts.append('COALESCE(image_filename, "") as image_filename')
-            elif col == 'created_at':
-                if col in old_columns:
-                    select_parts.append(col)
-                else:
-                    select_parts.append(f'"{current_timestamp}" as created_at')
+        old_columns = await self._table_columns(conn, 'expenses')
         
-        # Add audit columns with proper timestamps
-        select_parts.extend([
-            f'COALESCE(created_at, "{current_timestamp}") as created_on',
-            f'COALESCE(created_at, "{current_timestamp}") as modified_on'
-        ])
+        select_parts = [self._migration_expression(column, old_columns) for column in MIGRATED_EXPENSE_COLUMNS]
+        # Audit timestamps start out as the original creation time
+        created_at = select_parts[-1]
+        select_parts.extend([created_at, created_at])
         
         # Execute migration
         migrate_query = f'''
-            INSERT INTO expenses_new 
+            INSERT INTO expenses_new ({', '.join(MIGRATED_EXPENSE_COLUMNS)}, created_on, modified_on)
             SELECT {', '.join(select_parts)}
             FROM expenses
         '''
         await conn.execute(migrate_query)
         logger.info("Migrated existing expense data with audit timestamps")
     
+    @staticmethod
+    def _migration_expression(column: str, old_columns: FrozenSet[str]) -> str:
+        """SELECT expression for one migrated column: the old value, falling back to its default."""
+        default = EXPENSE_MIGRATION_DEFAULTS.get(column)
+        if column not in old_columns:
+            if default is None:
+                raise ValueError(f"Old expenses table has no {column} column")
+            return default
+        return column if default is None else f'COALESCE({column}, {default})'
+    
     async def _create_fresh_expenses_table(self, conn: aiosqlite.Connection) -> None:
         """Create a fresh expenses table if migration fails."""
         await conn.execute('DROP TABLE IF EXISTS expenses_new')
@@ -255,7 +625,8 @@ class DatabaseManager:
                 has_error INTEGER DEFAULT 0,
                 error_message TEXT DEFAULT NULL,
                 last_error_at TIMESTAMP DEFAULT NULL,
-                created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                image_sha256 TEXT DEFAULT NULL
             )
         ''')
         
@@ -278,7 +649,24 @@ class DatabaseManager:
             )
         ''')
     
+    async def _create_indexes(self, conn: aiosqlite.Connection) -> None:
+        """Create indexes for the listing, audit, and image-pruning queries."""
+        # Expense list (ORDER BY date DESC, created_at DESC) and draft list (ORDER BY created_on DESC)
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date DESC, created_at DESC)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_drafts_created_on ON drafts(created_on DESC)')
+        
+        # Audit history for one expense, newest first
+        await conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_audit_expense_id ON expense_audit_log(expense_id, audit_timestamp DESC)'
+        )
+        
+        # Lookups used when pruning images that are no longer referenced
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_drafts_image_sha256 ON drafts(image_sha256)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_expenses_image_sha256 ON expenses(image_sha256)')
+    
     async def _insert_default_categories(self, conn: aiosqlite.Connection) -> None:
         """Insert default expense categories."""
-        for category in config.DEFAULT_CATEGORIES:
-            await conn.execute('INSERT OR IGNORE INTO categories (name) VALUES (?)', (category,))
\ No newline at end of file
+        await conn.executemany(
+            'INSERT OR IGNORE INTO categories (name) VALUES (?)',
+            [(category,) for category in config.DEFAULT_CATEGORIES]
+        )
\ No newline at end of file
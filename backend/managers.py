@@ -3,64 +3,174 @@ Expense Tracker - Data Managers
 
 PURPOSE: Data access layer for expenses, drafts, and categories
 SCOPE: CRUD operations, data validation, and business logic
-DEPENDENCIES: aiosqlite, json, datetime
+DEPENDENCIES: database.py (SqlitePool), orjson, datetime
 """
 
-import json
+import mmap
+import time
+import hashlib
+import orjson
 import sqlite3
-import aiosqlite
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
 
 from .config import config
+from .database import BatchWriter, ImageFileCache, SqlitePool, image_digest
 
 logger = logging.getLogger(__name__)
 
 
+async def _store_image(conn, digest: str, image_data: Union[bytes, mmap.mmap], filename: str) -> None:
+    """Store an image once under its content hash (no-op if already stored)."""
+    await conn.execute(
+        'INSERT OR IGNORE INTO images (sha256, data, filename) VALUES (?, ?, ?)',
+        (digest, image_data, filename or '')
+    )
+
+
+SQLITE_MAX_VARIABLES = 999
+
+
+def _chunks(values: List[Any], size: int = SQLITE_MAX_VARIABLES):
+    """Yield successive slices small enough to bind as SQL parameters."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# created_on/modified_on formatted for display by SQLite; values it can't parse are passed through
+DISPLAY_TIMESTAMP_COLUMNS = (
+    "COALESCE(strftime('%Y-%m-%d %H:%M:%S', created_on), created_on) AS created_on, "
+    "COALESCE(strftime('%Y-%m-%d %H:%M:%S', modified_on), modified_on) AS modified_on"
+)
+
+
+def _display_timestamp(value: str) -> str:
+    """Format a stored ISO timestamp as 'YYYY-MM-DD HH:MM:SS'; values that don't parse are kept as-is."""
+    if not value:
+        return value
+    # Fast path for what this app stores: 'YYYY-MM-DDTHH:MM:SS[.ffffff]' or 'YYYY-MM-DD HH:MM:SS'
+    if len(value) in (19, 26) and value[10] in 'T ' and value[19:20] in ('', '.'):
+        return f'{value[:10]} {value[11:19]}'
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+    except (ValueError, AttributeError):
+        return value
+
+
+def _tuple_rows(cursor) -> List[str]:
+    """Switch a cursor to plain tuples and return its column names, for zipping rows into dicts.
+    
+    Building each dict with zip() skips allocating an aiosqlite.Row per row first.
+    """
+    cursor.row_factory = None
+    return [column[0] for column in cursor.description]
+
+
+async def _prune_images(conn, digests: List[str]) -> List[str]:
+    """Delete stored images that no draft or expense references any more; return their digests."""
+    pruned = []
+    for digest in set(digests):
+        if not digest:
+            continue
+        cursor = await conn.execute('''
+            DELETE FROM images WHERE sha256 = ?
+                AND NOT EXISTS (SELECT 1 FROM drafts WHERE image_sha256 = images.sha256)
+                AND NOT EXISTS (SELECT 1 FROM expenses WHERE image_sha256 = images.sha256)
+        ''', (digest,))
+        if cursor.rowcount:
+            pruned.append(digest)
+    return pruned
+
+
+async def _discard_cached(image_cache: Optional[ImageFileCache], digests: List[str]) -> None:
+    """Evict pruned images from the file cache once their delete has committed."""
+    if image_cache and digests:
+        await image_cache.discard(digests)
+
+
 class ExpenseManager:
     """Handles expense CRUD operations and data management."""
     
-    def __init__(self, db_file: str):
-        self.db_file = db_file
+    # Columns read back for audit rows and image pruning; never the legacy image_data BLOB
+    AUDIT_COLUMNS = (
+        'id, date, amount, currency, fx_rate, amount_eur, description, category, person, '
+        'beneficiary, image_sha256, image_filename, created_on, modified_on'
+    )
+    
+    INSERT_SQL = '''
+        INSERT INTO expenses (date, amount, currency, fx_rate, amount_eur, description, 
+                            category, person, beneficiary, image_sha256, image_filename, 
+                            created_on, modified_on)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    def __init__(self, pool: SqlitePool, image_cache: Optional[ImageFileCache] = None):
+        self.pool = pool
+        self.image_cache = image_cache
     
-    async def create_expense(self, expense_data: Dict[str, Any], image_data: bytes = None, 
+    async def create_expense(self, expense_data: Dict[str, Any], image_sha256: Optional[str] = None, 
                            image_filename: str = '') -> int:
-        """Create a new expense record."""
-        async with aiosqlite.connect(self.db_file) as conn:
+        """Create a new expense record referencing an already stored image."""
+        async with self.pool.writer() as conn:
             values = self._prepare_expense_values(expense_data, include_timestamps=True)
-            
-            cursor = await conn.execute('''
-                INSERT INTO expenses (date, amount, currency, fx_rate, amount_eur, description, 
-                                    category, person, beneficiary, image_data, image_filename, 
-                                    created_on, modified_on)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                values['date'], values['amount'], values['currency'], values['fx_rate'],
-                values['amount_eur'], values['description'], values['category'], 
-                values['person'], values['beneficiary'], image_data, image_filename or '',
-                values['created_on'], values['modified_on']
-            ))
-            
+            cursor = await conn.execute(self.INSERT_SQL, self._insert_row(values, image_sha256, image_filename))
             expense_id = cursor.lastrowid
-            await conn.commit()
             
-            # Log audit entry
-            audit_values = values.copy()
-            audit_values.update({'image_filename': image_filename or '', 'has_image': bool(image_data)})
-            await self._log_audit(expense_id, 'INSERT', None, audit_values)
+            # Log audit entry in the same transaction
+            await self._insert_audit_rows(conn, [self._insert_audit_row(expense_id, values, image_sha256, image_filename)])
+            await conn.commit()
+        
+        return expense_id
+    
+    async def confirm_drafts(self, items: Dict[int, Tuple[Dict[str, Any], Optional[str], str]]
+                             ) -> Tuple[List[int], Dict[int, str]]:
+        """Turn validated drafts into expenses and delete those drafts in one transaction.
+        
+        items maps draft_id -> (expense_data, image_sha256, image_filename). Each draft is
+        deleted and its expense inserted in its own SAVEPOINT: a draft already confirmed or
+        deleted by a concurrent request creates nothing, and a failing row is rolled back
+        alone with its draft kept. Returns the confirmed draft ids and an error per failure.
+        """
+        if not items:
+            return [], {}
+        
+        confirmed, errors, audit_rows = [], {}, []
+        async with self.pool.writer() as conn:
+            await conn.execute('BEGIN IMMEDIATE')
+            for draft_id, (expense_data, image_sha256, image_filename) in items.items():
+                await conn.execute('SAVEPOINT confirm_draft')
+                try:
+                    # Claim the draft first so overlapping confirms can't both turn it into an expense
+                    cursor = await conn.execute('DELETE FROM drafts WHERE id = ?', (draft_id,))
+                    if cursor.rowcount != 1:
+                        raise LookupError("Draft no longer exists")
+                    values = self._prepare_expense_values(expense_data, include_timestamps=True)
+                    cursor = await conn.execute(self.INSERT_SQL, self._insert_row(values, image_sha256, image_filename))
+                except Exception as e:
+                    await conn.execute('ROLLBACK TO confirm_draft')
+                    await conn.execute('RELEASE confirm_draft')
+                    errors[draft_id] = str(e)
+                    continue
+                await conn.execute('RELEASE confirm_draft')
+                audit_rows.append(self._insert_audit_row(cursor.lastrowid, values, image_sha256, image_filename))
+                confirmed.append(draft_id)
             
-            return expense_id
+            await self._insert_audit_rows(conn, audit_rows)
+            await conn.commit()
+        
+        return confirmed, errors
     
     async def update_expense(self, expense_id: int, expense_data: Dict[str, Any]) -> bool:
-        """Update an existing expense record."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
+        """Update an existing expense record and log the change in one transaction."""
+        async with self.pool.writer() as conn:
+            await conn.execute('BEGIN IMMEDIATE')
             
             # Get old values for audit
-            cursor = await conn.execute("SELECT * FROM expenses WHERE id = ?", (expense_id,))
+            cursor = await conn.execute(f"SELECT {self.AUDIT_COLUMNS} FROM expenses WHERE id = ?", (expense_id,))
             old_row = await cursor.fetchone()
             if not old_row:
+                await conn.rollback()
                 return False
             
             old_values = self._sanitize_expense_data(dict(old_row))
@@ -79,71 +189,78 @@ class ExpenseManager:
                 new_values['modified_on'], expense_id
             ))
             
+            await self._insert_audit_rows(conn, [self._audit_row(expense_id, 'UPDATE', old_values, new_values)])
             await conn.commit()
-            
-            # Log audit entry
-            await self._log_audit(expense_id, 'UPDATE', old_values, new_values)
-            return True
+        
+        return True
     
     async def delete_expense(self, expense_id: int) -> bool:
-        """Delete an expense record."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
+        """Delete an expense record and log the deletion in one transaction."""
+        async with self.pool.writer() as conn:
+            await conn.execute('BEGIN IMMEDIATE')
             
             # Get expense data for audit
-            cursor = await conn.execute("SELECT * FROM expenses WHERE id = ?", (expense_id,))
+            cursor = await conn.execute(f"SELECT {self.AUDIT_COLUMNS} FROM expenses WHERE id = ?", (expense_id,))
             expense_row = await cursor.fetchone()
             if not expense_row:
+                await conn.rollback()
                 return False
             
             deleted_values = self._sanitize_expense_data(dict(expense_row))
             
             # Delete the record
             await conn.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+            pruned = await _prune_images(conn, [expense_row['image_sha256']])
+            await self._insert_audit_rows(conn, [self._audit_row(expense_id, 'DELETE', deleted_values, None)])
             await conn.commit()
-            
-            # Log audit entry
-            await self._log_audit(expense_id, 'DELETE', deleted_values, None)
-            return True
+        
+        await _discard_cached(self.image_cache, pruned)
+        return True
     
     async def bulk_delete_expenses(self, expense_ids: List[int]) -> int:
-        """Delete multiple expense records."""
+        """Delete multiple expense records and their audit entries in one transaction."""
         if not expense_ids:
             return 0
         
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
-            
-            # Get expenses for audit
-            placeholders = ','.join('?' * len(expense_ids))
-            cursor = await conn.execute(f"SELECT * FROM expenses WHERE id IN ({placeholders})", expense_ids)
-            expenses_to_delete = [dict(row) for row in await cursor.fetchall()]
+        async with self.pool.writer() as conn:
+            await conn.execute('BEGIN IMMEDIATE')
+            expenses_to_delete = []
+            deleted_count = 0
+            for chunk in _chunks(list(dict.fromkeys(expense_ids))):
+                placeholders = ','.join('?' * len(chunk))
+                # Get expenses for audit
+                cursor = await conn.execute(
+                    f"SELECT {self.AUDIT_COLUMNS} FROM expenses WHERE id IN ({placeholders})", chunk
+                )
+                expenses_to_delete.extend(dict(row) for row in await cursor.fetchall())
+                
+                # Delete the records
+                cursor = await conn.execute(f"DELETE FROM expenses WHERE id IN ({placeholders})", chunk)
+                deleted_count += cursor.rowcount
             
             if not expenses_to_delete:
+                await conn.rollback()
                 return 0
             
-            # Delete the records
-            query = f"DELETE FROM expenses WHERE id IN ({placeholders})"
-            cursor = await conn.execute(query, expense_ids)
-            deleted_count = cursor.rowcount
-            await conn.commit()
-            
-            # Log audit entries
-            for expense_data in expenses_to_delete:
-                expense_id = expense_data['id']
-                deleted_values = self._sanitize_expense_data(expense_data)
-                await self._log_audit(expense_id, 'DELETE', deleted_values, None)
+            pruned = await _prune_images(conn, [expense['image_sha256'] for expense in expenses_to_delete])
             
-            return deleted_count
+            # Log audit entries alongside the deletes
+            await self._insert_audit_rows(conn, [
+                self._audit_row(expense['id'], 'DELETE', self._sanitize_expense_data(expense), None)
+                for expense in expenses_to_delete
+            ])
+            await conn.commit()
+        
+        await _discard_cached(self.image_cache, pruned)
+        return deleted_count
     
     async def get_expense(self, expense_id: int) -> Optional[Dict[str, Any]]:
         """Get a single expense by ID."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
-            cursor = await conn.execute('''
+        async with self.pool.reader() as conn:
+            cursor = await conn.execute(f'''
                 SELECT id, date, amount, currency, fx_rate, amount_eur, description, 
-                       category, person, beneficiary, image_filename, created_on, modified_on,
-                       CASE WHEN image_data IS NOT NULL THEN 1 ELSE 0 END as has_image_data 
+                       category, person, beneficiary, image_filename, {DISPLAY_TIMESTAMP_COLUMNS},
+                       CASE WHEN image_sha256 IS NOT NULL THEN 1 ELSE 0 END as has_image_data 
                 FROM expenses WHERE id = ?
             ''', (expense_id,))
             
@@ -156,31 +273,62 @@ class ExpenseManager:
             sanitized['has_image'] = bool(expense_data.get('has_image_data', 0))
             return sanitized
     
+    # Expenses read per reader checkout when paging through the whole table
+    PAGE_SIZE = 500
+    
     async def get_all_expenses(self) -> List[Dict[str, Any]]:
-        """Get all expenses ordered by date and creation time."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
-            cursor = await conn.execute('''
-                SELECT id, date, amount, currency, fx_rate, amount_eur, description, 
-                       category, person, beneficiary, image_filename, created_on, modified_on,
-                       CASE WHEN image_data IS NOT NULL THEN 1 ELSE 0 END as has_image
-                FROM expenses 
-                ORDER BY date DESC, created_at DESC
-            ''')
+        """Get all expenses, newest date first."""
+        return [expense async for page in self.iter_expense_pages() for expense in page]
+    
+    async def iter_expense_pages(self, page_size: int = PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield all expenses, newest date first, in keyset pages of at most page_size.
+        
+        The reader goes back to the pool before each page is yielded, so a slow consumer
+        never pins a connection (or its WAL snapshot) and memory stays bounded by one page.
+        Within a date, higher ids (later inserts) come first.
+        """
+        after: Tuple = ()
+        while True:
+            async with self.pool.reader() as conn:
+                async with conn.execute(f'''
+                    SELECT id, date, amount, currency, fx_rate, amount_eur, description, 
+                           category, person, beneficiary, image_filename, {DISPLAY_TIMESTAMP_COLUMNS},
+                           CASE WHEN image_sha256 IS NOT NULL THEN 1 ELSE 0 END as has_image
+                    FROM expenses 
+                    {'WHERE (date, id) < (?, ?)' if after else ''}
+                    ORDER BY date DESC, id DESC
+                    LIMIT ?
+                ''', (*after, page_size)) as cursor:
+                    cursor.row_factory = None
+                    rows = await cursor.fetchall()
             
-            return [self._sanitize_expense_data(dict(row)) for row in await cursor.fetchall()]
+            if rows:
+                yield [self._expense_from_row(row) for row in rows]
+            if len(rows) < page_size:
+                return
+            after = (rows[-1][1], rows[-1][0])
     
     async def get_expense_image(self, expense_id: int) -> Tuple[Optional[bytes], Optional[str]]:
         """Get expense image data and filename."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            cursor = await conn.execute('SELECT image_data, image_filename FROM expenses WHERE id = ?', (expense_id,))
+        async with self.pool.reader() as conn:
+            cursor = await conn.execute('''
+                SELECT i.data, e.image_filename
+                FROM expenses e LEFT JOIN images i ON i.sha256 = e.image_sha256
+                WHERE e.id = ?
+            ''', (expense_id,))
+            row = await cursor.fetchone()
+            return (row[0], row[1]) if row else (None, None)
+    
+    async def get_expense_image_ref(self, expense_id: int) -> Tuple[Optional[str], Optional[str]]:
+        """Get the stored image hash and filename of an expense without reading the image."""
+        async with self.pool.reader() as conn:
+            cursor = await conn.execute('SELECT image_sha256, image_filename FROM expenses WHERE id = ?', (expense_id,))
             row = await cursor.fetchone()
             return (row[0], row[1]) if row else (None, None)
     
     async def get_expense_audit_history(self, expense_id: int) -> List[Dict[str, Any]]:
         """Get audit history for a specific expense."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
+        async with self.pool.reader() as conn:
             cursor = await conn.execute('''
                 SELECT id, expense_id, operation, old_values, new_values, changes, 
                        audit_timestamp, user_info
@@ -201,51 +349,65 @@ class ExpenseManager:
                 
                 # Parse JSON fields safely
                 try:
-                    entry['old_values'] = json.loads(row['old_values']) if row['old_values'] else None
-                except (json.JSONDecodeError, TypeError):
+                    entry['old_values'] = orjson.loads(row['old_values']) if row['old_values'] else None
+                except (orjson.JSONDecodeError, TypeError):
                     entry['old_values'] = None
                 
                 try:
-                    entry['new_values'] = json.loads(row['new_values']) if row['new_values'] else None
-                except (json.JSONDecodeError, TypeError):
+                    entry['new_values'] = orjson.loads(row['new_values']) if row['new_values'] else None
+                except (orjson.JSONDecodeError, TypeError):
                     entry['new_values'] = None
                 
                 try:
-                    entry['changes'] = json.loads(row['changes']) if row['changes'] else {}
-                except (json.JSONDecodeError, TypeError):
+                    entry['changes'] = orjson.loads(row['changes']) if row['changes'] else {}
+                except (orjson.JSONDecodeError, TypeError):
                     entry['changes'] = {}
                 
                 audit_entries.append(entry)
             
             return audit_entries
     
-    async def _log_audit(self, expense_id: int, operation: str, old_values: dict = None, 
-                        new_values: dict = None, user_info: str = 'system'):
-        """Log an audit entry for expense changes."""
-        try:
-            changes = {}
-            if old_values and new_values:
-                for key in new_values:
-                    if key in old_values and old_values[key] != new_values[key]:
-                        changes[key] = {'from': old_values[key], 'to': new_values[key]}
-            
-            async with aiosqlite.connect(self.db_file) as conn:
-                await conn.execute('''
-                    INSERT INTO expense_audit_log 
-                    (expense_id, operation, old_values, new_values, changes, user_info) 
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    expense_id, operation, 
-                    json.dumps(old_values) if old_values else None,
-                    json.dumps(new_values) if new_values else None,
-                    json.dumps(changes) if changes else None,
-                    user_info
-                ))
-                await conn.commit()
-                logger.info(f"Audit log created: expense_id={expense_id}, operation={operation}")
-                
-        except Exception as e:
-            logger.error(f"Failed to log audit entry: {e}")
+    def _audit_row(self, expense_id: int, operation: str, old_values: dict = None, 
+                   new_values: dict = None, user_info: str = 'system') -> tuple:
+        """Build the expense_audit_log row for one change."""
+        changes = {}
+        if old_values and new_values:
+            for key in new_values:
+                if key in old_values and old_values[key] != new_values[key]:
+                    changes[key] = {'from': old_values[key], 'to': new_values[key]}
+        
+        return (
+            expense_id, operation, 
+            orjson.dumps(old_values).decode() if old_values else None,
+            orjson.dumps(new_values).decode() if new_values else None,
+            orjson.dumps(changes).decode() if changes else None,
+            user_info
+        )
+    
+    @staticmethod
+    def _insert_row(values: dict, image_sha256: Optional[str], image_filename: str) -> tuple:
+        """Order prepared expense values for INSERT_SQL."""
+        return (
+            values['date'], values['amount'], values['currency'], values['fx_rate'],
+            values['amount_eur'], values['description'], values['category'], 
+            values['person'], values['beneficiary'], image_sha256, image_filename or '',
+            values['created_on'], values['modified_on']
+        )
+    
+    def _insert_audit_row(self, expense_id: int, values: dict, image_sha256: Optional[str], 
+                          image_filename: str) -> tuple:
+        """Build the audit row recording a newly created expense."""
+        audit_values = values.copy()
+        audit_values.update({'image_filename': image_filename or '', 'has_image': bool(image_sha256)})
+        return self._audit_row(expense_id, 'INSERT', None, audit_values)
+    
+    async def _insert_audit_rows(self, conn, rows: List[tuple]) -> None:
+        """Insert prepared audit rows on the caller's connection (no commit)."""
+        await conn.executemany('''
+            INSERT INTO expense_audit_log 
+            (expense_id, operation, old_values, new_values, changes, user_info) 
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp as ISO string."""
@@ -286,62 +448,109 @@ class ExpenseManager:
             'person': str(row_data.get('person', '')),
             'beneficiary': str(row_data.get('beneficiary', '')),
             'has_image': bool(row_data.get('has_image') or row_data.get('image_filename')),
-            'created_on': str(row_data.get('created_on', '')),
-            'modified_on': str(row_data.get('modified_on', ''))
+            'created_on': _display_timestamp(str(row_data.get('created_on', ''))),
+            'modified_on': _display_timestamp(str(row_data.get('modified_on', '')))
         }
-        
-        # Format timestamps for display
-        for timestamp_field in ['created_on', 'modified_on']:
-            if sanitized[timestamp_field]:
-                try:
-                    dt = datetime.fromisoformat(sanitized[timestamp_field].replace('Z', '+00:00'))
-                    sanitized[timestamp_field] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                except (ValueError, AttributeError):
-                    pass
-        
         return sanitized
+    
+    @staticmethod
+    def _expense_from_row(row: tuple) -> Dict[str, Any]:
+        """Same result as _sanitize_expense_data, built straight from a get_all_expenses tuple.
+        
+        The query already formats the timestamps, so they are only converted to strings here.
+        """
+        (expense_id, date, amount, currency, fx_rate, amount_eur, description, category,
+         person, beneficiary, image_filename, created_on, modified_on, has_image) = row
+        return {
+            'id': int(expense_id),
+            'date': str(date),
+            'amount': float(amount),
+            'currency': str(currency),
+            'fx_rate': float(fx_rate),
+            'amount_eur': float(amount_eur),
+            'description': str(description),
+            'category': str(category),
+            'person': str(person),
+            'beneficiary': str(beneficiary),
+            'has_image': bool(has_image or image_filename),
+            'created_on': str(created_on),
+            'modified_on': str(modified_on)
+        }
 
 
 class DraftManager:
     """Handles draft expense operations from OCR processing with error handling."""
     
-    def __init__(self, db_file: str):
-        self.db_file = db_file
+    def __init__(self, pool: SqlitePool, batch_writer: Optional[BatchWriter] = None,
+                 image_cache: Optional[ImageFileCache] = None):
+        self.pool = pool
+        self.batch_writer = batch_writer  # group-commits draft inserts from concurrent uploads
+        self.image_cache = image_cache
     
     async def save_draft(self, upload_group_id: str, expense_data: Dict[str, Any], 
-                         image_data: bytes, image_filename: str) -> int:
-        """Save a new draft expense."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            cursor = await conn.execute('''
+                         image_data: Union[bytes, mmap.mmap], image_filename: str,
+                         image_sha256: Optional[str] = None) -> int:
+        """Save a new draft expense (image_data may be any bytes-like buffer, e.g. an mmap)."""
+        draft_ids = await self.save_drafts_bulk(
+            upload_group_id, [expense_data], image_data, image_filename, image_sha256
+        )
+        return draft_ids[0]
+    
+    async def save_drafts_bulk(self, upload_group_id: str, items: List[Dict[str, Any]], 
+                               image_data: Union[bytes, mmap.mmap], image_filename: str,
+                               image_sha256: Optional[str] = None) -> List[int]:
+        """Save all drafts parsed from one image in a single transaction.
+        
+        The image is stored once in the images table and referenced by hash.
+        """
+        if not items:
+            return []
+        
+        digest = image_sha256 or image_digest(image_data)
+        
+        rows = [(
+            upload_group_id,
+            item.get('date'),
+            item.get('amount'),
+            item.get('currency'),
+            item.get('fx_rate'),
+            item.get('amount_eur'),
+            item.get('description'),
+            item.get('category'),
+            item.get('person'),
+            item.get('beneficiary'),
+            item.get('date_warning'),
+            digest,
+            image_filename,
+            0,  # has_error = False initially
+            None,  # error_message = None initially
+            None   # last_error_at = None initially
+        ) for item in items]
+        
+        async def insert(conn) -> List[int]:
+            await _store_image(conn, digest, image_data, image_filename)
+            await conn.executemany('''
                 INSERT INTO drafts (upload_group_id, date, amount, currency, fx_rate, amount_eur, 
                                     description, category, person, beneficiary, date_warning,
-                                    image_data, image_filename, has_error, error_message, last_error_at)
+                                    image_sha256, image_filename, has_error, error_message, last_error_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                upload_group_id,
-                expense_data.get('date'),
-                expense_data.get('amount'),
-                expense_data.get('currency'),
-                expense_data.get('fx_rate'),
-                expense_data.get('amount_eur'),
-                expense_data.get('description'),
-                expense_data.get('category'),
-                expense_data.get('person'),
-                expense_data.get('beneficiary'),
-                expense_data.get('date_warning'),
-                image_data,
-                image_filename,
-                0,  # has_error = False initially
-                None,  # error_message = None initially
-                None   # last_error_at = None initially
-            ))
-            draft_id = cursor.lastrowid
+            ''', rows)
+            # The writer is exclusive, so AUTOINCREMENT ids for this batch are contiguous
+            cursor = await conn.execute('SELECT last_insert_rowid()')
+            last_id = (await cursor.fetchone())[0]
+            return list(range(last_id - len(rows) + 1, last_id + 1))
+        
+        if self.batch_writer is not None:
+            return await self.batch_writer.submit(insert)
+        
+        async with self.pool.writer() as conn:
+            draft_ids = await insert(conn)
             await conn.commit()
-            return draft_id
+        return draft_ids
 
     async def update_draft(self, draft_id: int, draft_data: Dict[str, Any]) -> bool:
         """Update a draft with new data (for auto-saving functionality)."""
-        async with aiosqlite.connect(self.db_file) as conn:
+        async with self.pool.writer() as conn:
             cursor = await conn.execute('''
                 UPDATE drafts 
                 SET date=?, amount=?, currency=?, fx_rate=?, amount_eur=?, description=?, 
@@ -364,27 +573,26 @@ class DraftManager:
 
     async def get_all_drafts(self) -> List[Dict[str, Any]]:
         """Get all pending drafts."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
+        async with self.pool.reader() as conn:
             cursor = await conn.execute('''
                 SELECT id, upload_group_id, date, amount, currency, fx_rate, amount_eur, 
                        description, category, person, beneficiary, date_warning, image_filename, 
                        created_on, has_error, error_message, last_error_at,
-                       CASE WHEN image_data IS NOT NULL THEN 1 ELSE 0 END as has_image
+                       CASE WHEN image_sha256 IS NOT NULL THEN 1 ELSE 0 END as has_image
                 FROM drafts
                 ORDER BY created_on DESC
             ''')
-            return [dict(row) for row in await cursor.fetchall()]
+            columns = _tuple_rows(cursor)
+            return [dict(zip(columns, row)) for row in await cursor.fetchall()]
 
     async def get_draft(self, draft_id: int) -> Optional[Dict[str, Any]]:
         """Get a single draft by ID for processing."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            conn.row_factory = aiosqlite.Row
+        async with self.pool.reader() as conn:
             cursor = await conn.execute(
                 """SELECT id, upload_group_id, date, amount, currency, fx_rate, amount_eur, 
                           description, category, person, beneficiary, date_warning, image_filename, 
                           created_on, has_error, error_message, last_error_at,
-                          CASE WHEN image_data IS NOT NULL THEN 1 ELSE 0 END as has_image 
+                          CASE WHEN image_sha256 IS NOT NULL THEN 1 ELSE 0 END as has_image 
                    FROM drafts WHERE id = ?""", 
                 (draft_id,)
             )
@@ -395,9 +603,25 @@ class DraftManager:
             # Convert row to a mutable dict and return (excluding binary image_data)
             return dict(row)
     
+    async def get_drafts_many(self, draft_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get several drafts (including their image hash) keyed by ID."""
+        drafts = {}
+        async with self.pool.reader() as conn:
+            for chunk in _chunks(list(dict.fromkeys(draft_ids))):
+                placeholders = ','.join('?' * len(chunk))
+                cursor = await conn.execute(f"""
+                    SELECT id, upload_group_id, date, amount, currency, fx_rate, amount_eur,
+                           description, category, person, beneficiary, date_warning, image_filename,
+                           image_sha256, created_on, has_error, error_message, last_error_at
+                    FROM drafts WHERE id IN ({placeholders})
+                """, chunk)
+                for row in await cursor.fetchall():
+                    drafts[row['id']] = dict(row)
+        return drafts
+
     async def mark_draft_error(self, draft_id: int, error_message: str) -> bool:
         """Mark a draft as having an error."""
-        async with aiosqlite.connect(self.db_file) as conn:
+        async with self.pool.writer() as conn:
             cursor = await conn.execute('''
                 UPDATE drafts 
                 SET has_error = 1, error_message = ?, last_error_at = ?
@@ -406,9 +630,23 @@ class DraftManager:
             await conn.commit()
             return cursor.rowcount > 0
     
+    async def mark_drafts_errors(self, errors: Dict[int, str]) -> None:
+        """Mark several drafts as having errors in one transaction."""
+        if not errors:
+            return
+
+        now = datetime.now().isoformat()
+        async with self.pool.writer() as conn:
+            await conn.executemany('''
+                UPDATE drafts
+                SET has_error = 1, error_message = ?, last_error_at = ?
+                WHERE id = ?
+            ''', [(message, now, draft_id) for draft_id, message in errors.items()])
+            await conn.commit()
+
     async def clear_draft_error(self, draft_id: int) -> bool:
         """Clear error state from a draft."""
-        async with aiosqlite.connect(self.db_file) as conn:
+        async with self.pool.writer() as conn:
             cursor = await conn.execute('''
                 UPDATE drafts 
                 SET has_error = 0, error_message = NULL, last_error_at = NULL
@@ -419,37 +657,77 @@ class DraftManager:
             
     async def get_draft_image(self, draft_id: int) -> Tuple[Optional[bytes], Optional[str]]:
         """Get draft image data and filename."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            cursor = await conn.execute('SELECT image_data, image_filename FROM drafts WHERE id = ?', (draft_id,))
+        async with self.pool.reader() as conn:
+            cursor = await conn.execute('''
+                SELECT i.data, d.image_filename
+                FROM drafts d LEFT JOIN images i ON i.sha256 = d.image_sha256
+                WHERE d.id = ?
+            ''', (draft_id,))
+            row = await cursor.fetchone()
+            return (row[0], row[1]) if row else (None, None)
+    
+    async def get_draft_image_ref(self, draft_id: int) -> Tuple[Optional[str], Optional[str]]:
+        """Get the stored image hash and filename of a draft without reading the image."""
+        async with self.pool.reader() as conn:
+            cursor = await conn.execute('SELECT image_sha256, image_filename FROM drafts WHERE id = ?', (draft_id,))
             row = await cursor.fetchone()
             return (row[0], row[1]) if row else (None, None)
     
     async def delete_draft(self, draft_id: int) -> bool:
-        """Delete a draft."""
-        async with aiosqlite.connect(self.db_file) as conn:
-            cursor = await conn.execute('DELETE FROM drafts WHERE id = ?', (draft_id,))
+        """Delete a draft and its image unless an expense still references it."""
+        async with self.pool.writer() as conn:
+            cursor = await conn.execute('SELECT image_sha256 FROM drafts WHERE id = ?', (draft_id,))
+            row = await cursor.fetchone()
+            if not row:
+                return False
+            
+            await conn.execute('DELETE FROM drafts WHERE id = ?', (draft_id,))
+            pruned = await _prune_images(conn, [row[0]])
             await conn.commit()
-            return cursor.rowcount > 0
+        
+        await _discard_cached(self.image_cache, pruned)
+        return True
 
 
 class CategoryManager:
-    """Handles expense category operations."""
+    """Handles expense category operations with a short-lived in-process cache."""
     
-    def __init__(self, db_file: str):
-        self.db_file = db_file
+    def __init__(self, pool: SqlitePool, cache_ttl: float = config.CATEGORY_CACHE_TTL):
+        self.pool = pool
+        self.cache_ttl = cache_ttl
+        self._cache: Optional[Tuple[float, List[str], str]] = None  # (loaded_at, categories, etag)
+        self._generation = 0  # bumped on every add so in-flight reads don't repopulate stale data
     
     async def get_all_categories(self) -> List[str]:
         """Get all available expense categories."""
-        async with aiosqlite.connect(self.db_file) as conn:
+        categories, _ = await self.get_categories_with_etag()
+        return categories
+    
+    async def get_categories_with_etag(self) -> Tuple[List[str], str]:
+        """Get the categories and their ETag, hashed once per cache fill."""
+        if self._cache is not None and time.monotonic() - self._cache[0] < self.cache_ttl:
+            return self._cache[1], self._cache[2]
+        
+        generation = self._generation
+        async with self.pool.reader() as conn:
             cursor = await conn.execute('SELECT name FROM categories ORDER BY name')
-            return [row[0] for row in await cursor.fetchall()]
+            categories = [row[0] for row in await cursor.fetchall()]
+        
+        digest = hashlib.md5('\n'.join(categories).encode(), usedforsecurity=False).hexdigest()
+        etag = f'"{digest}"'
+        if generation == self._generation:
+            self._cache = (time.monotonic(), categories, etag)
+        return categories, etag
     
     async def add_category(self, name: str) -> bool:
         """Add a new expense category."""
-        async with aiosqlite.connect(self.db_file) as conn:
+        async with self.pool.writer() as conn:
             try:
                 await conn.execute('INSERT INTO categories (name) VALUES (?)', (name,))
                 await conn.commit()
+                self._cache = None
+                self._generation += 1
                 return True
             except sqlite3.IntegrityError:
+                await conn.rollback()
                 return False  # Category already exists
\ No newline at end of file
@@ -3,49 +3,73 @@ Expense Tracker - OCR Processing
 
 PURPOSE: Image processing and text extraction using Tesseract OCR
 SCOPE: OCR processing, image preprocessing, and text extraction
-DEPENDENCIES: pytesseract, cv2, PIL, numpy
+DEPENDENCIES: pytesseract, cv2, PIL, numpy, httpx, database.py (SqlitePool)
 """
 
+import re
+import time
 import asyncio
+import mmap
 import cv2
 import numpy as np
 import pytesseract
 import logging
+import httpx
 from PIL import Image
 import io
-from typing import List, Dict, Any
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+from .config import config
+from .database import SqlitePool
+from .parsers import RevolutParser, ABNAmroSingleParser, ABNAmroListParser, GenericParser
 
 logger = logging.getLogger(__name__)
 
 
+def _open_image(image_bytes: Union[bytes, mmap.mmap]) -> Image.Image:
+    """Open image bytes, reading memory-mapped uploads in place instead of copying them."""
+    if isinstance(image_bytes, mmap.mmap):
+        image_bytes.seek(0)
+        return Image.open(image_bytes)
+    return Image.open(io.BytesIO(image_bytes))
+
+
 class OCRProcessor:
     """Base class for OCR processing with common functionality."""
     
+    OCR_CONFIG = r'--oem 3 --psm 6 -l nld+eng'
+    
     @staticmethod
-    async def process_image_with_ocr(image_bytes: bytes) -> str:
-        """Extract text from image using OCR."""
-        try:
-            image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+    def extract_text(image_bytes: Union[bytes, mmap.mmap]) -> str:
+        """Decode, grayscale and OCR an image (blocking; run it in an executor)."""
+        # OpenCV decodes JPEG/PNG/WEBP/TIFF/BMP straight to grayscale in one pass
+        gray = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            # Formats OpenCV can't read (GIF, HEIC) go through PIL
+            image = _open_image(image_bytes).convert('RGB')
             gray = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2GRAY)
-            
+        return pytesseract.image_to_string(gray, config=OCRProcessor.OCR_CONFIG)
+    
+    @staticmethod
+    async def process_image_with_ocr(image_bytes: Union[bytes, mmap.mmap]) -> str:
+        """Extract text from image bytes or a memory-mapped upload using OCR."""
+        try:
+            # Image decoding is CPU work too, so the whole pipeline runs off the event loop
             loop = asyncio.get_running_loop()
-            ocr_config = r'--oem 3 --psm 6 -l nld+eng'
-            
-            text = await loop.run_in_executor(
-                None,
-                lambda: pytesseract.image_to_string(gray, config=ocr_config)
-            )
-            
-            return text
+            return await loop.run_in_executor(None, OCRProcessor.extract_text, image_bytes)
             
         except Exception as e:
-            logger.error(f"OCR processing error: {e}")
+            logger.error("OCR processing error: %s", e)
             return ""
 
 
 class SourceIdentifier:
     """Identifies the source/type of receipt from OCR text."""
     
+    # A debit amount such as "- 12,50"; several of them mark an ABN AMRO list view
+    ABN_LIST_AMOUNT_RE = re.compile(r'-\s*\d+,\d{2}')
+    
     @staticmethod
     def identify_source(text: str) -> str:
         """Identify the source of the OCR text (e.g., Revolut, ABN AMRO)."""
@@ -67,7 +91,7 @@ class SourceIdentifier:
                 return 'ABN_AMRO_SINGLE'
             
             # Check for list patterns (multiple amounts on different lines)
-            if len(re.findall(r'-\s*\d+,\d{2}', text_lower)) > 1:
+            if len(SourceIdentifier.ABN_LIST_AMOUNT_RE.findall(text_lower)) > 1:
                 logger.info("Identified source: ABN_AMRO_LIST")
                 return 'ABN_AMRO_LIST'
             
@@ -82,12 +106,13 @@ class SourceIdentifier:
 class OCRProcessingService:
     """Main service for processing images with OCR and parsing expense data."""
     
-    def __init__(self):
-        from .parsers import (
-            RevolutParser, ABNAmroSingleParser, 
-            ABNAmroListParser, GenericParser
-        )
-        
+    # Memoized (currency, date) rates kept at most; the oldest is dropped first
+    FX_CACHE_MAX_ENTRIES = 256
+    
+    def __init__(self, pool: SqlitePool):
+        self.pool = pool
+        self._fx_cache: Dict[Tuple[str, str], Tuple[float, float]] = {}  # (currency, date) -> (expires_at, rate)
+        self._http: Optional[httpx.AsyncClient] = None  # kept open so FX lookups reuse the TLS connection
         self.source_identifier = SourceIdentifier()
         self.parsers = {
             'Revolut': RevolutParser(),
@@ -96,7 +121,7 @@ class OCRProcessingService:
             'Generic': GenericParser()
         }
     
-    async def process_image(self, image_bytes: bytes) -> List[Dict[str, Any]]:
+    async def process_image(self, image_bytes: Union[bytes, mmap.mmap]) -> List[Dict[str, Any]]:
         """Process an image and return parsed expense data."""
         try:
             # Extract text using OCR
@@ -112,10 +137,13 @@ class OCRProcessingService:
             # Parse the expense data
             parsed_data = parser.parse(text)
             
-            # Post-process results with FX rates
+            # Post-process results with FX rates, looking up each distinct (currency, date) once
+            pairs = list(dict.fromkeys((item.get('currency', 'EUR'), item.get('date')) for item in parsed_data))
+            rates = dict(zip(pairs, await asyncio.gather(*(self._get_fx_rate(*pair) for pair in pairs))))
+            
             final_results = []
             for item in parsed_data:
-                fx_rate = await self._get_fx_rate(item.get('currency', 'EUR'), item.get('date'))
+                fx_rate = rates[(item.get('currency', 'EUR'), item.get('date'))]
                 item['fx_rate'] = fx_rate
                 item['amount_eur'] = round(item.get('amount', 0.0) / fx_rate, 2) if fx_rate and item.get('amount') else 0.0
                 item.setdefault('person', 'Közös')
@@ -125,7 +153,7 @@ class OCRProcessingService:
             return final_results
             
         except Exception as e:
-            logger.error(f"OCR processing error: {e}")
+            logger.error("OCR processing error: %s", e)
             return []
     
     async def _get_fx_rate(self, currency: str, target_date: str = None) -> float:
@@ -133,43 +161,68 @@ class OCRProcessingService:
         if currency == 'EUR':
             return 1.0
         
-        from datetime import date
-        from .config import config
-        import aiosqlite
-        import httpx
-        
         target_date = target_date or date.today().isoformat()
+        key = (currency, target_date)
+        
+        # Check the in-process cache, then the database cache
+        memoized = self._fx_cache.get(key)
+        if memoized and memoized[0] > time.monotonic():
+            return memoized[1]
         
-        # Check cache first
-        async with aiosqlite.connect(config.DB_FILE) as conn:
-            cursor = await conn.execute(
+        async with self.pool.reader() as conn:
+            # Close the cursor before returning the reader so no read snapshot stays open
+            async with conn.execute(
                 'SELECT rate FROM fx_rates WHERE date = ? AND currency = ?', 
                 (target_date, currency)
-            )
-            cached = await cursor.fetchone()
-            if cached:
-                return cached[0]
+            ) as cursor:
+                cached = await cursor.fetchone()
+        if cached:
+            self._remember_fx_rate(key, cached[0])
+            return cached[0]
         
         # Fetch from API
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get('https://api.exchangerate-api.com/v4/latest/EUR')
-                response.raise_for_status()
-                data = response.json()
-                rate = data.get('rates', {}).get(currency)
-                
-                if rate:
-                    # Cache the rate
-                    async with aiosqlite.connect(config.DB_FILE) as conn:
-                        await conn.execute(
-                            'INSERT OR REPLACE INTO fx_rates (date, currency, rate) VALUES (?, ?, ?)', 
-                            (target_date, currency, rate)
-                        )
-                        await conn.commit()
-                    return rate
+            response = await self._http_client().get('https://api.exchangerate-api.com/v4/latest/EUR')
+            response.raise_for_status()
+            data = response.json()
+            rate = data.get('rates', {}).get(currency)
+            
+            if rate:
+                # Cache the rate
+                async with self.pool.writer() as conn:
+                    await conn.execute(
+                        'INSERT OR REPLACE INTO fx_rates (date, currency, rate) VALUES (?, ?, ?)', 
+                        (target_date, currency, rate)
+                    )
+                    await conn.commit()
+                self._remember_fx_rate(key, rate)
+                return rate
                     
         except Exception as e:
-            logger.error(f"FX rate API error: {e}")
+            logger.error("FX rate API error: %s", e)
         
         # Return fallback rate
-        return config.FALLBACK_FX_RATES.get(currency, 1.0)
\ No newline at end of file
+        return config.FALLBACK_FX_RATES.get(currency, 1.0)
+    
+    def _http_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client for the FX API, created on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=10.0, limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+            )
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (call on shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    def _remember_fx_rate(self, key: Tuple[str, str], rate: float) -> None:
+        """Memoize a resolved rate; past dates are stable, so they are kept longer than today's."""
+        is_historical = key[1] < date.today().isoformat()
+        ttl = config.FX_CACHE_TTL_HISTORICAL if is_historical else config.FX_CACHE_TTL_TODAY
+        self._fx_cache.pop(key, None)
+        if len(self._fx_cache) >= self.FX_CACHE_MAX_ENTRIES:
+            del self._fx_cache[next(iter(self._fx_cache))]
+        self._fx_cache[key] = (time.monotonic() + ttl, rate)
@@ -8,11 +8,94 @@ DEPENDENCIES: re, datetime, logging
 
 import re
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import; parse() runs many of them per receipt
+_NOISE_PATTERNS = [
+    re.compile(r',PAS\d+', re.IGNORECASE),  # Remove ,PAS011 type codes
+    re.compile(r'^BEA,\s*', re.IGNORECASE),  # Remove BEA prefix
+    re.compile(r'\s*,\s*$', re.IGNORECASE),  # Remove trailing commas
+]
+_DESCRIPTION_SPLIT_RE = re.compile(r'[,\s]+')
+_DESCRIPTION_CODE_RE = re.compile(r'^(bea|pas\d+)$')
+
+# Checked in order: the first category with any keyword in the text wins
+_CATEGORY_KEYWORDS = {
+    'Restaurants': ['restaurant', 'pizzeria', 'pompernikkel', 'eetcafe'],
+    'Groceries': ['supermarket', 'albert heijn', 'jumbo', 'lidl', 'aldi', 'global supermarkt'],
+    'Household': ['household', 'bakkerij', 'kiosk', 'sapn'],
+    'Caffeine': ['coffee', 'cafe', 'koffie', 'starbucks', 'espresso'],
+    'Car': ['fuel', 'gas', 'petrol', 'parking', 'sanef', 'autoroute', 'esso', 'rouenpalaisauto'],
+    'Transport': ['transport', 'taxi', 'uber', 'bus', 'train'],
+    'Sport': ['zwembad', 'swimming', 'gym', 'fitness', 'sport', 'tennis', 'voetbal', 'hockey']
+}
+_CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+]
+
+_REVOLUT_AMOUNT_RE = re.compile(r'-?€?(\d+[.,]\d{2})')
+_REVOLUT_CHARGED_RE = re.compile(r'charged by merchant\s+€(\d+[.,]\d{2})', re.IGNORECASE)
+_REVOLUT_DATE_RE = re.compile(r'(\w+\s+\d+)')
+_CATEGORY_RE = re.compile(r'Category\s+([\w\s&]+)', re.IGNORECASE)
+_TIME_RE = re.compile(r'^\d{2}:\d{2}')
+_AMOUNT_ONLY_RE = re.compile(r'^[€\d\s,.-]+$')
+
+_AMOUNT_PATTERNS = [
+    re.compile(r'€\s*(-?\d+[,.]\d{2})'),  # €1.524,55 or €-6,50
+    re.compile(r'(-?\d+[,.]\d{2})\s*€'),  # 1.524,55€ or -6,50€
+    re.compile(r'€\s*(-?\d+[,.]?\d*)'),   # €1524 or €6
+]
+_SIGNED_AMOUNT_RE = re.compile(r'(-?\d+[,.]\d{2})')
+_EXEC_DATE_RE = re.compile(r'Execution\s*\n\s*([^\n]+)', re.IGNORECASE)
+_DATE_PATTERNS = [
+    _EXEC_DATE_RE,
+    re.compile(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+(\d{1,2})\s+(\w+)\s+(\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2})\s+(januari|februari|maart|april|mei|juni|juli|augustus|september|oktober|november|december)\s+(\d{4})', re.IGNORECASE),
+]
+_JUNK_RE = re.compile(
+    'payment terminal|execution|from account|balance after payment|description|google pay'
+    '|tikkie payment request|share this transaction|actions|your total|charged by merchant'
+)
+_ALPHA_RE = re.compile(r'[a-zA-Z]')
+_NUM_ONLY_RE = re.compile(r'^[\d\s€,.+-]+$')
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('january', 'januari'), ('february', 'februari'), ('march', 'maart'),
+        ('april',), ('may', 'mei'), ('june', 'juni'), ('july', 'juli'),
+        ('august', 'augustus'), ('september',), ('october', 'oktober'),
+        ('november',), ('december',),
+    ], 1)
+    for name in names
+}
+_WEEKDAYS = frozenset([
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+    'maandag', 'dinsdag', 'woensdag', 'donderdag', 'vrijdag', 'zaterdag', 'zondag',
+])
+
+_LIST_TXN_RE = re.compile(r'(.+?)\s+-\s*(\d+,\d{2})$')
+
+_TOTAL_RE = re.compile(r'(?:total|totaal|amount|bedrag)[:\s]+(\d+[,.]\d{2})', re.IGNORECASE)
+_AMOUNT_FINDALL_RE = re.compile(r'(\d+[.,]\d{2})')
+_NUMERIC_DATE_RE = re.compile(r'(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})')
+
+
+def _month_date(day: str, month_name: str, year: str) -> Optional[str]:
+    """Build an ISO date from a day, English or Dutch month name and year; None if invalid."""
+    month = _MONTHS.get(month_name.lower())
+    if month is None or not (day.isdecimal() and len(day) <= 2 and year.isdecimal() and len(year) == 4):
+        return None
+    try:
+        return date(int(year), month, int(day)).isoformat()
+    except ValueError:  # Day outside the month, e.g. 31 February
+        return None
+
 
 class ExpenseParser:
     """Base class for expense parsing with common utilities."""
@@ -21,18 +104,8 @@ class ExpenseParser:
     def smart_categorize(text: str) -> str:
         """Enhanced smart categorization with better keyword matching."""
         text_lower = text.lower()
-        category_map = {
-            'Restaurants': ['restaurant', 'pizzeria', 'pompernikkel', 'eetcafe'],
-            'Groceries': ['supermarket', 'albert heijn', 'jumbo', 'lidl', 'aldi', 'global supermarkt'],
-            'Household': ['household', 'bakkerij', 'kiosk', 'sapn'],
-            'Caffeine': ['coffee', 'cafe', 'koffie', 'starbucks', 'espresso'],
-            'Car': ['fuel', 'gas', 'petrol', 'parking', 'sanef', 'autoroute', 'esso', 'rouenpalaisauto'],
-            'Transport': ['transport', 'taxi', 'uber', 'bus', 'train'],
-            'Sport': ['zwembad', 'swimming', 'gym', 'fitness', 'sport', 'tennis', 'voetbal', 'hockey']
-        }
-        
-        for category, keywords in category_map.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for category, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(text_lower):
                 return category
         return 'Other'
     
@@ -43,21 +116,15 @@ class ExpenseParser:
             return description
         
         # Remove technical codes and noise
-        noise_patterns = [
-            r',PAS\d+',  # Remove ,PAS011 type codes
-            r'^BEA,\s*',  # Remove BEA prefix
-            r'\s*,\s*$',  # Remove trailing commas
-        ]
-        
         cleaned = description
-        for pattern in noise_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in _NOISE_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
         
         # Combine meaningful parts (e.g., SAPN + Google Pay)
         if 'sapn' in cleaned.lower() and 'google pay' in cleaned.lower():
             # Extract the parts and combine cleanly
-            parts = re.split(r'[,\s]+', cleaned)
-            meaningful_parts = [part for part in parts if part and not re.match(r'^(bea|pas\d+)$', part.lower())]
+            parts = _DESCRIPTION_SPLIT_RE.split(cleaned)
+            meaningful_parts = [part for part in parts if part and not _DESCRIPTION_CODE_RE.match(part.lower())]
             if len(meaningful_parts) > 1:
                 cleaned = ' '.join(meaningful_parts)
         
@@ -81,7 +148,7 @@ class ExpenseParser:
             return None
         
         # Remove currency symbols and extra whitespace
-        cleaned = re.sub(r'[€$£-]', '', amount_str).strip()
+        cleaned = amount_str.replace('€', '').replace('$', '').replace('£', '').replace('-', '').strip()
         
         # Handle European format: 1.524,55 or 1,524.55
         # If there are both dots and commas, determine which is decimal
@@ -108,7 +175,7 @@ class ExpenseParser:
         try:
             return float(cleaned)
         except ValueError:
-            logger.warning(f"Could not parse amount: {amount_str}")
+            logger.warning("Could not parse amount: %s", amount_str)
             return None
 
 
@@ -126,18 +193,18 @@ class RevolutParser(ExpenseParser):
         # Check for relative date first
         relative_date = self.detect_relative_date(text)
         if relative_date:
-            logger.info(f"Revolut: Detected relative date '{relative_date}', leaving date empty")
+            logger.info("Revolut: Detected relative date '%s', leaving date empty", relative_date)
             result['date'] = ''  # Leave empty for user to fill
             result['date_warning'] = f"Original showed '{relative_date}' - please verify date"
         
         # Extract amount - improved pattern
-        amount_match = re.search(r'-?€?(\d+[.,]\d{2})', lines[0])
+        amount_match = _REVOLUT_AMOUNT_RE.search(lines[0])
         if amount_match:
             result['amount'] = self.parse_european_amount(amount_match.group(1))
         else:
             # Fallback amount search in other lines
             for line in lines:
-                amount_match = re.search(r'charged by merchant\s+€(\d+[.,]\d{2})', line, re.IGNORECASE)
+                amount_match = _REVOLUT_CHARGED_RE.search(line)
                 if amount_match:
                     result['amount'] = self.parse_european_amount(amount_match.group(1))
                     break
@@ -148,9 +215,9 @@ class RevolutParser(ExpenseParser):
             for i in range(1, min(4, len(lines))):
                 line = lines[i].strip()
                 # Skip lines that look like timestamps or other metadata
-                if re.match(r'^\d{2}:\d{2}', line) or 'today' in line.lower():
+                if _TIME_RE.match(line) or 'today' in line.lower():
                     continue
-                if len(line) > 1 and not re.match(r'^[€\d\s,.-]+$', line):
+                if len(line) > 1 and not _AMOUNT_ONLY_RE.match(line):
                     result['description'] = self.clean_description(line)
                     break
         
@@ -158,7 +225,7 @@ class RevolutParser(ExpenseParser):
         if 'date' not in result:
             # Try to parse specific date formats in Revolut
             date_str = ' '.join(lines[2:4]) if len(lines) > 3 else ''
-            date_match = re.search(r'(\w+\s+\d+)', date_str)
+            date_match = _REVOLUT_DATE_RE.search(date_str)
             if date_match:
                 try:
                     parsed_date = datetime.strptime(
@@ -172,7 +239,7 @@ class RevolutParser(ExpenseParser):
                 result['date'] = datetime.now().strftime('%Y-%m-%d')
         
         # Extract category
-        category_match = re.search(r'Category\s+([\w\s&]+)', text, re.IGNORECASE)
+        category_match = _CATEGORY_RE.search(text)
         if category_match:
             result['category'] = category_match.group(1).strip()
 
@@ -193,17 +260,18 @@ class ABNAmroSingleParser(ExpenseParser):
     def parse(self, text: str) -> List[Dict[str, Any]]:
         """Parse ABN AMRO single transaction data with improved robustness."""
         lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines_lower = [line.lower() for line in lines]
         full_text = '\n'.join(lines)
         amount, trx_date, description = None, None, None
 
         # Enhanced amount extraction with multiple strategies
-        amount = self._extract_amount_robust(full_text, lines)
+        amount = self._extract_amount_robust(full_text, lines, lines_lower)
         
         # Extract transaction date
         trx_date = self._extract_date(full_text)
         
         # Extract and clean description
-        description = self._extract_description(lines, amount, trx_date)
+        description = self._extract_description(lines, lines_lower, amount, trx_date)
 
         # Validate and return result
         if amount is not None and description:
@@ -219,41 +287,31 @@ class ABNAmroSingleParser(ExpenseParser):
         logger.warning("ABN AMRO Single parser could not find essential amount or description.")
         return []
     
-    def _extract_amount_robust(self, full_text: str, lines: List[str]) -> Optional[float]:
+    def _extract_amount_robust(self, full_text: str, lines: List[str], lines_lower: List[str]) -> Optional[float]:
         """Robust amount extraction with multiple strategies."""
-        # Strategy 1: Look for amount near currency symbol
-        amount_patterns = [
-            r'€\s*(-?\d+[,.]\d{2})',  # €1.524,55 or €-6,50
-            r'(-?\d+[,.]\d{2})\s*€',  # 1.524,55€ or -6,50€
-            r'€\s*(-?\d+[,.]?\d*)',   # €1524 or €6
-        ]
-        
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, full_text)
-            if matches:
-                # Take the first reasonable amount
-                for match in matches:
-                    amount = self.parse_european_amount(match)
-                    if amount is not None and 0.01 <= abs(amount) <= 100000:
-                        logger.info(f"ABN Parser: Found amount with pattern {pattern}: {amount}")
-                        return amount
+        # Strategy 1: Look for amount near currency symbol, taking the first reasonable one
+        for pattern in _AMOUNT_PATTERNS:
+            for match in pattern.finditer(full_text):
+                amount = self.parse_european_amount(match.group(1))
+                if amount is not None and 0.01 <= abs(amount) <= 100000:
+                    logger.info("ABN Parser: Found amount with pattern %s: %s", pattern.pattern, amount)
+                    return amount
         
         # Strategy 2: Look for amounts in specific lines
-        for line in lines:
-            if any(indicator in line.lower() for indicator in ['balance', 'charged', 'your total']):
-                amount_match = re.search(r'(-?\d+[,.]\d{2})', line)
+        for line, line_lower in zip(lines, lines_lower):
+            if 'balance' in line_lower or 'charged' in line_lower or 'your total' in line_lower:
+                amount_match = _SIGNED_AMOUNT_RE.search(line)
                 if amount_match:
                     amount = self.parse_european_amount(amount_match.group(1))
                     if amount is not None:
-                        logger.info(f"ABN Parser: Found amount in context line: {amount}")
+                        logger.info("ABN Parser: Found amount in context line: %s", amount)
                         return amount
         
         # Strategy 3: Any reasonable amount in the text
-        all_amounts = re.findall(r'(-?\d+[,.]\d{2})', full_text)
-        for amount_str in all_amounts:
-            amount = self.parse_european_amount(amount_str)
+        for match in _SIGNED_AMOUNT_RE.finditer(full_text):
+            amount = self.parse_european_amount(match.group(1))
             if amount is not None and 0.01 <= abs(amount) <= 100000:
-                logger.info(f"ABN Parser: Found fallback amount: {amount}")
+                logger.info("ABN Parser: Found fallback amount: %s", amount)
                 return amount
         
         logger.warning("ABN Parser: No valid amount found")
@@ -261,87 +319,58 @@ class ABNAmroSingleParser(ExpenseParser):
     
     def _extract_date(self, full_text: str) -> Optional[str]:
         """Extract transaction date with improved patterns."""
-        # Multiple date patterns
-        date_patterns = [
-            r'Execution\s*\n\s*([^\n]+)',  # Original pattern
-            r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+(\d{1,2})\s+(\w+)\s+(\d{4})',
-            r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})',
-            r'(\d{1,2})\s+(januari|februari|maart|april|mei|juni|juli|augustus|september|oktober|november|december)\s+(\d{4})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, full_text, re.IGNORECASE)
-            if match:
-                try:
-                    if pattern == date_patterns[0]:  # Execution pattern
-                        date_str = match.group(1).strip()
-                        date_parts = date_str.split()
-                        if len(date_parts) >= 3:
-                            date_str_cleaned = " ".join(date_parts[-3:])
-                            parsed_date = datetime.strptime(date_str_cleaned, '%d %B %Y')
-                            result = parsed_date.strftime('%Y-%m-%d')
-                            logger.info(f"ABN Parser: Found date: {result}")
-                            return result
-                    elif len(match.groups()) == 4:  # Day name pattern
-                        day_num, month_name, year = match.group(2), match.group(3), match.group(4)
-                        parsed_date = datetime.strptime(f"{day_num} {month_name} {year}", '%d %B %Y')
-                        result = parsed_date.strftime('%Y-%m-%d')
-                        logger.info(f"ABN Parser: Found date with day name: {result}")
-                        return result
-                    elif len(match.groups()) == 3:  # Month name pattern
-                        day_num, month_name, year = match.groups()
-                        parsed_date = datetime.strptime(f"{day_num} {month_name} {year}", '%d %B %Y')
-                        result = parsed_date.strftime('%Y-%m-%d')
-                        logger.info(f"ABN Parser: Found date: {result}")
-                        return result
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"Could not parse date from match '{match.group(0)}': {e}")
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(full_text)
+            if not match:
+                continue
+            if pattern is _EXEC_DATE_RE:
+                date_parts = match.group(1).split()
+                if len(date_parts) < 3:
                     continue
+                day_num, month_name, year = date_parts[-3:]
+            elif len(match.groups()) == 4:  # Day name pattern
+                day_num, month_name, year = match.group(2), match.group(3), match.group(4)
+            else:  # Month name pattern
+                day_num, month_name, year = match.groups()
+            
+            result = _month_date(day_num, month_name, year)
+            if result:
+                logger.info("ABN Parser: Found date: %s", result)
+                return result
+            logger.warning("Could not parse date from match '%s'", match.group(0))
         
         logger.warning("ABN Parser: Date pattern not found")
         return None
     
-    def _extract_description(self, lines: List[str], amount: float, trx_date: str) -> Optional[str]:
+    def _extract_description(self, lines: List[str], lines_lower: List[str], amount: float, trx_date: str) -> Optional[str]:
         """Extract description by filtering out known junk patterns."""
-        known_junk = [
-            'payment terminal', 'execution', 'from account', 'balance after payment', 
-            'description', 'google pay', 'tikkie payment request', 'share this transaction', 
-            'actions', 'your total', 'charged by merchant'
-        ]
+        amount_text = f"{amount:.2f}".replace('.', ',') if amount else None
+        month_name = None
+        if trx_date:
+            try:
+                month_name = datetime.strptime(trx_date, '%Y-%m-%d').strftime('%B').lower()
+            except ValueError:
+                pass
         
-        candidate_lines = []
-        for line in lines:
-            line_lower = line.lower()
-            
+        for line, line_lower in zip(lines, lines_lower):
             # Skip junk lines
-            if any(junk in line_lower for junk in known_junk):
+            if _JUNK_RE.search(line_lower):
                 continue
-            if re.match(r'\d{2}:\d{2}', line):  # Skip time patterns
+            if _TIME_RE.match(line):  # Skip time patterns
                 continue
-            if amount and f"{amount:.2f}".replace('.', ',') in line:  # Skip amount lines
+            if amount_text and amount_text in line:  # Skip amount lines
+                continue
+            if month_name and month_name in line_lower:  # Skip date lines
                 continue
-            if trx_date:
-                try:
-                    date_obj = datetime.strptime(trx_date, '%Y-%m-%d')
-                    if date_obj.strftime('%B').lower() in line_lower:  # Skip date lines
-                        continue
-                except:
-                    pass
             
-            # Include lines with actual content
-            if re.search(r'[a-zA-Z]', line) and len(line) > 2:
-                # Skip lines that are mostly numbers or symbols
-                if not re.match(r'^[\d\s€,.+-]+$', line):
-                    candidate_lines.append(line)
-
-        if candidate_lines:
-            # Take the first meaningful line
-            description = candidate_lines[0].strip()
-            logger.info(f"ABN Parser: Found description: '{description}'")
-            return description
-        else:
-            logger.warning("ABN Parser: Could not find a suitable description line.")
-            return None
+            # Take the first line with actual content that isn't mostly numbers or symbols
+            if _ALPHA_RE.search(line) and len(line) > 2 and not _NUM_ONLY_RE.match(line):
+                description = line.strip()
+                logger.info("ABN Parser: Found description: '%s'", description)
+                return description
+
+        logger.warning("ABN Parser: Could not find a suitable description line.")
+        return None
 
 
 class ABNAmroListParser(ExpenseParser):
@@ -358,26 +387,25 @@ class ABNAmroListParser(ExpenseParser):
         
         # Find the date for the whole list
         for line in lines:
-            try:
-                # Format "Thursday 29 May 2025"
-                parsed_date = datetime.strptime(line, '%A %d %B %Y')
-                current_date = parsed_date.strftime('%Y-%m-%d')
-                break
-            except ValueError:
-                continue
+            # Format "Thursday 29 May 2025"
+            parts = line.split()
+            if len(parts) == 4 and parts[0].lower() in _WEEKDAYS:
+                header_date = _month_date(*parts[1:])
+                if header_date:
+                    current_date = header_date
+                    break
         
         # Process transaction lines
         for line in lines:
             # Regex to find description and amount on the same line
-            match = re.match(r'(.+?)\s+-\s*(\d+,\d{2})$', line)
+            match = _LIST_TXN_RE.match(line)
             if match:
                 description = match.group(1).strip()
                 amount_str = match.group(2)
                 amount = self.parse_european_amount(amount_str)
                 
                 # Avoid matching the date line as a transaction
-                weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                if description.lower() not in weekdays and amount is not None:
+                if description.lower() not in _WEEKDAYS and amount is not None:
                     cleaned_desc = self.clean_description(description)
                     results.append({
                         'description': cleaned_desc,
@@ -396,25 +424,23 @@ class GenericParser(ExpenseParser):
     def parse(self, text: str) -> List[Dict[str, Any]]:
         """Parse generic receipt data from OCR text."""
         # Look for total amount
-        amount_match = re.search(r'(?:total|totaal|amount|bedrag)[:\s]+(\d+[,.]\d{2})', text, re.IGNORECASE)
+        amount_match = _TOTAL_RE.search(text)
         if amount_match:
             amount = self.parse_european_amount(amount_match.group(1))
         else:
             # Look for standalone amounts and pick the largest
-            amounts = re.findall(r'(\d+[.,]\d{2})', text)
-            if amounts:
-                parsed_amounts = [self.parse_european_amount(a) for a in amounts]
-                valid_amounts = [a for a in parsed_amounts if a is not None]
-                amount = max(valid_amounts) if valid_amounts else 0.0
-            else:
-                amount = 0.0
+            amount = 0.0
+            for match in _AMOUNT_FINDALL_RE.finditer(text):
+                candidate = self.parse_european_amount(match.group(1))
+                if candidate is not None and candidate > amount:
+                    amount = candidate
 
         lines = [line.strip() for line in text.split('\n') if line.strip()]
         description = lines[0] if lines else 'Scanned Expense'
         
         # Extract date
         current_date = datetime.now().strftime('%Y-%m-%d')
-        date_match = re.search(r'(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})', text)
+        date_match = _NUMERIC_DATE_RE.search(text)
         if date_match:
             try:
                 d_str = date_match.group(1).replace('-', '/')
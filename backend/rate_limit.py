@@ -0,0 +1,51 @@
+"""
+Expense Tracker - Rate Limiting
+
+PURPOSE: Per-client request throttling for expensive endpoints
+SCOPE: In-process token buckets keyed by client address
+DEPENDENCIES: None (standard library only)
+"""
+
+import time
+from typing import Dict, Tuple
+
+
+class TokenBucketLimiter:
+    """Token bucket per client: refills at `rate` tokens per `period` seconds up to `capacity`."""
+
+    # Forget idle clients once this many are tracked
+    MAX_TRACKED_CLIENTS = 10000
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: float = None):
+        self.capacity = capacity if capacity is not None else rate
+        self.refill_per_second = rate / period
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def consume(self, key: str, tokens: float = 1) -> bool:
+        """Take tokens from a client's bucket; return False (taking nothing) if too few remain."""
+        now = time.monotonic()
+        available, updated_at = self._buckets.get(key, (self.capacity, now))
+        available = min(self.capacity, available + (now - updated_at) * self.refill_per_second)
+
+        allowed = available >= tokens
+        if allowed:
+            available -= tokens
+
+        if key not in self._buckets and len(self._buckets) >= self.MAX_TRACKED_CLIENTS:
+            self._forget_idle(now)
+        self._buckets[key] = (available, now)
+        return allowed
+
+    def retry_after(self, key: str, tokens: float = 1) -> int:
+        """Seconds until a client's bucket holds enough tokens again."""
+        available, updated_at = self._buckets.get(key, (self.capacity, time.monotonic()))
+        missing = tokens - available - (time.monotonic() - updated_at) * self.refill_per_second
+        return max(1, int(missing / self.refill_per_second) + 1) if missing > 0 else 0
+
+    def _forget_idle(self, now: float) -> None:
+        """Drop buckets that have refilled completely, since they behave like new clients."""
+        full_after = self.capacity / self.refill_per_second
+        self._buckets = {
+            key: state for key, state in self._buckets.items()
+            if now - state[1] < full_after
+        }
@@ -0,0 +1,65 @@
+"""
+Expense Tracker - Request Schemas
+
+PURPOSE: Typed request models for form-encoded API payloads
+SCOPE: Parsing and whitespace normalization of submitted expense forms, ID bounds
+DEPENDENCIES: pydantic, FastAPI
+"""
+
+import inspect
+from typing import Any, Callable, Literal, Type, TypeVar
+
+from fastapi import Form
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, Field, PositiveFloat, PositiveInt, ValidationError, conlist
+
+from .config import config
+
+# Non-empty, bounded list of record IDs for bulk endpoints
+BulkIds = conlist(PositiveInt, min_length=1, max_length=config.BULK_MAX_IDS)
+
+# Currencies offered by the expense form
+Currency = Literal['EUR', 'HUF', 'USD']
+
+DESCRIPTION_MAX_LENGTH = 500
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+def as_form(model: Type[ModelT]) -> Callable[..., ModelT]:
+    """Build a Depends() callable that reads a model's fields from form data.
+    
+    The form parameters are derived from model_fields, so the model stays the only place
+    its constraints are declared; a model validation error is reported as a 422.
+    """
+    def dependency(**data: Any) -> ModelT:
+        try:
+            return model(**data)
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, 'loc': ('body', *error['loc'])} for error in exc.errors(include_url=False)]
+            ) from exc
+    
+    dependency.__signature__ = inspect.Signature([
+        inspect.Parameter(
+            name, inspect.Parameter.KEYWORD_ONLY, annotation=field.annotation,
+            default=Form(...) if field.is_required() else Form(field.default)
+        )
+        for name, field in model.model_fields.items()
+    ])
+    return dependency
+
+
+class ExpenseForm(BaseModel):
+    """Expense fields submitted when confirming a draft or editing an expense."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    date: str
+    amount: float
+    currency: Currency
+    fx_rate: PositiveFloat
+    amount_eur: float
+    description: str = Field(max_length=DESCRIPTION_MAX_LENGTH)
+    category: str
+    person: str
+    beneficiary: str = ''
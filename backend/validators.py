@@ -6,30 +6,36 @@ SCOPE: Input validation, business logic checks, and error handling
 DEPENDENCIES: typing
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _required(message: str) -> Callable[[Any], Optional[str]]:
+    """Validator that rejects a missing or blank value."""
+    return lambda value: None if (value.strip() if isinstance(value, str) else value) else message
+
+
+def _validate_amount(value: Any) -> Optional[str]:
+    """Amounts must be present and positive."""
+    return None if value and value > 0 else "Amount must be greater than 0"
+
+
+# Per-field validators for expenses, in the order their errors are reported
+EXPENSE_FIELD_VALIDATORS: Dict[str, Callable[[Any], Optional[str]]] = {
+    'date': _required("Date is required"),
+    'amount': _validate_amount,
+    'description': _required("Description is required"),
+    'category': _required("Category is required"),
+    'person': _required("Person (who paid) is required"),
+}
 
 
 def validate_expense_data(expense_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """Validate expense data and return validation result with error messages."""
     errors = []
-    
-    # Check required fields
-    if not expense_data.get('date'):
-        errors.append("Date is required")
-    
-    amount = expense_data.get('amount')
-    if not amount or amount <= 0:
-        errors.append("Amount must be greater than 0")
-    
-    if not expense_data.get('description', '').strip():
-        errors.append("Description is required")
-    
-    if not expense_data.get('category', '').strip():
-        errors.append("Category is required")
-    
-    if not expense_data.get('person', '').strip():
-        errors.append("Person (who paid) is required")
-    
+    for field, validator in EXPENSE_FIELD_VALIDATORS.items():
+        error = validator(expense_data.get(field))
+        if error:
+            errors.append(error)
     return len(errors) == 0, errors
 
 
@@ -45,6 +51,27 @@ def validate_draft_data(draft_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     return len(errors) == 0, errors
 
 
+IMAGE_HEADER_SIZE = 16
+
+_IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',        # JPEG
+    b'\x89PNG\r\n\x1a\n',    # PNG
+    b'GIF87a', b'GIF89a',    # GIF
+    b'BM',                   # BMP
+    b'II*\x00', b'MM\x00*',   # TIFF
+)
+_HEIF_BRANDS = (b'heic', b'heix', b'hevc', b'hevx', b'mif1', b'msf1')
+
+
+def is_image_header(header: bytes) -> bool:
+    """Check the leading bytes of a file against known image magic numbers."""
+    if header.startswith(_IMAGE_SIGNATURES):
+        return True
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return True
+    return header[4:8] == b'ftyp' and header[8:12] in _HEIF_BRANDS
+
+
 def validate_category_name(name: str) -> Tuple[bool, List[str]]:
     """Validate category name."""
     errors = []
@@ -0,0 +1,30 @@
+"""
+Expense Tracker - Shared Test Fixtures
+
+PURPOSE: Fresh, fully migrated databases for manager and cache tests
+SCOPE: pytest fixtures only
+DEPENDENCIES: pytest, backend.database
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+from backend.database import DatabaseManager, SqlitePool
+
+
+@pytest.fixture
+def with_pool(tmp_path) -> Callable[[Callable[[SqlitePool], Awaitable[Any]]], Any]:
+    """Run an async test body against a pool on a new database, all in one event loop."""
+    def run(body: Callable[[SqlitePool], Awaitable[Any]]) -> Any:
+        async def main():
+            pool = SqlitePool(str(tmp_path / 'expenses.db'), readers=2)
+            await pool.open()
+            try:
+                await DatabaseManager(pool).initialize_database()
+                return await body(pool)
+            finally:
+                await pool.close()
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,74 @@
+"""
+Expense Tracker - Connection Pool Tests
+
+PURPOSE: Regression tests for the shared writer, its rollback, and group commit
+SCOPE: SqlitePool and BatchWriter against a real SQLite file
+DEPENDENCIES: pytest, backend.database
+"""
+
+import asyncio
+
+import pytest
+
+from backend.database import BatchWriter
+
+
+async def _category_names(pool):
+    async with pool.reader() as conn:
+        cursor = await conn.execute('SELECT name FROM categories ORDER BY name')
+        return [row[0] for row in await cursor.fetchall()]
+
+
+def test_writer_rolls_back_on_error(with_pool):
+    async def body(pool):
+        with pytest.raises(RuntimeError):
+            async with pool.writer() as conn:
+                await conn.execute('BEGIN IMMEDIATE')
+                await conn.execute("INSERT INTO categories (name) VALUES ('Lost')")
+                raise RuntimeError('boom')
+        
+        # The writer went back to the pool usable and without the half-done insert
+        async with pool.writer() as conn:
+            await conn.execute("INSERT INTO categories (name) VALUES ('Kept')")
+            await conn.commit()
+        return await _category_names(pool)
+    
+    names = with_pool(body)
+    
+    assert 'Kept' in names and 'Lost' not in names
+
+
+def test_batch_writer_isolates_failing_jobs(with_pool):
+    def insert(name):
+        async def job(conn):
+            await conn.execute('INSERT INTO categories (name) VALUES (?)', (name,))
+            if name == 'Bad':
+                raise ValueError(name)
+            return name
+        return job
+    
+    async def body(pool):
+        writer = BatchWriter(pool)
+        try:
+            results = await asyncio.gather(
+                *(writer.submit(insert(name)) for name in ['First', 'Bad', 'Last']), return_exceptions=True
+            )
+        finally:
+            await writer.stop()
+        return results, await _category_names(pool)
+    
+    results, names = with_pool(body)
+    
+    assert results[0] == 'First' and isinstance(results[1], ValueError) and results[2] == 'Last'
+    assert 'First' in names and 'Last' in names and 'Bad' not in names
+
+
+def test_batch_writer_fails_queued_jobs_on_stop(with_pool):
+    async def body(pool):
+        writer = BatchWriter(pool)
+        future = asyncio.get_running_loop().create_future()
+        writer._queue.put_nowait((None, future))
+        await writer.stop()
+        return future.exception()
+    
+    assert isinstance(with_pool(body), RuntimeError)
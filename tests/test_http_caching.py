@@ -0,0 +1,48 @@
+"""
+Expense Tracker - HTTP Caching Tests
+
+PURPOSE: Regression tests for conditional requests and response compression
+SCOPE: ETag matching and the GZip middleware's image bypass
+DEPENDENCIES: pytest, fastapi, backend.app
+"""
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from backend.app import ImageBypassGZipMiddleware, _etag_matches
+
+
+def _request(if_none_match: str) -> Request:
+    return Request({'type': 'http', 'headers': [(b'if-none-match', if_none_match.encode())]})
+
+
+@pytest.mark.parametrize('header', ['"abc"', 'W/"abc"', '"x", W/"abc"', '*'])
+def test_etag_matches_weakly(header):
+    assert _etag_matches(_request(header), '"abc"')
+
+
+@pytest.mark.parametrize('header', ['"abcd"', '"x", "y"', ''])
+def test_etag_mismatch(header):
+    assert not _etag_matches(_request(header), '"abc"')
+
+
+def test_gzip_skips_image_routes():
+    app = FastAPI()
+    app.add_middleware(ImageBypassGZipMiddleware, minimum_size=10)
+    
+    @app.get('/drafts/1/image')
+    def image():
+        return Response(b'\x89PNG' * 1000, media_type='image/png')
+    
+    @app.get('/drafts')
+    def drafts():
+        return Response(b'[]' * 1000, media_type='application/json')
+    
+    client = TestClient(app)
+    image_response = client.get('/drafts/1/image', headers={'Accept-Encoding': 'gzip'})
+    drafts_response = client.get('/drafts', headers={'Accept-Encoding': 'gzip'})
+    
+    assert 'content-encoding' not in image_response.headers
+    assert image_response.content == b'\x89PNG' * 1000
+    assert drafts_response.headers['content-encoding'] == 'gzip'
@@ -0,0 +1,70 @@
+"""
+Expense Tracker - Image File Cache Tests
+
+PURPOSE: Regression tests for trimming and eviction of cached image files
+SCOPE: ImageFileCache on its own and wired into DraftManager
+DEPENDENCIES: pytest, backend.database, backend.managers
+"""
+
+import asyncio
+import os
+import time
+
+from backend.database import ImageFileCache, image_digest
+from backend.managers import DraftManager
+
+
+def _cache_file(cache: ImageFileCache, image_data: bytes, age: float = 0.0) -> str:
+    digest = image_digest(image_data)
+    path = asyncio.run(cache.path_for(digest, lambda: asyncio.sleep(0, image_data)))
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_trim_drops_oldest_idle_files(tmp_path):
+    cache = ImageFileCache(str(tmp_path), max_bytes=10)
+    oldest = _cache_file(cache, b'a' * 6, age=300)
+    older = _cache_file(cache, b'b' * 6, age=200)
+    newest = _cache_file(cache, b'c' * 6)
+    
+    assert not os.path.exists(oldest) and not os.path.exists(older)
+    assert os.path.exists(newest)
+
+
+def test_trim_keeps_files_in_use_even_over_budget(tmp_path):
+    cache = ImageFileCache(str(tmp_path), max_bytes=10)
+    served = _cache_file(cache, b'a' * 6, age=300)
+    
+    # A hit marks the file in use, so a concurrent write can't delete it before it is sent
+    assert asyncio.run(cache.path_for(os.path.basename(served), lambda: asyncio.sleep(0, None))) == served
+    newest = _cache_file(cache, b'b' * 6)
+    
+    assert os.path.exists(served) and os.path.exists(newest)
+
+
+def test_discard_skips_files_in_use(tmp_path):
+    cache = ImageFileCache(str(tmp_path))
+    idle = _cache_file(cache, b'idle', age=300)
+    served = _cache_file(cache, b'served')
+    
+    asyncio.run(cache.discard([os.path.basename(idle), os.path.basename(served), 'not-a-digest']))
+    
+    assert not os.path.exists(idle) and os.path.exists(served)
+
+
+def test_deleting_last_reference_evicts_cached_file(with_pool, tmp_path):
+    cache = ImageFileCache(str(tmp_path / 'cache'))
+    
+    async def body(pool):
+        draft_manager = DraftManager(pool, image_cache=cache)
+        draft_ids = await draft_manager.save_drafts_bulk('group', [{'description': 'x'}] * 2, b'\x89PNG', 'r.png')
+        path = await cache.path_for(image_digest(b'\x89PNG'), lambda: asyncio.sleep(0, b'\x89PNG'))
+        os.utime(path, (0, 0))
+        
+        await draft_manager.delete_draft(draft_ids[0])
+        still_cached = os.path.exists(path)  # the other draft still references the image
+        await draft_manager.delete_draft(draft_ids[1])
+        return still_cached, os.path.exists(path)
+    
+    assert with_pool(body) == (True, False)
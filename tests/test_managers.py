@@ -0,0 +1,87 @@
+"""
+Expense Tracker - Data Manager Tests
+
+PURPOSE: Regression tests for expense listing and draft confirmation
+SCOPE: ExpenseManager and DraftManager against a real SQLite file
+DEPENDENCIES: pytest, backend.managers
+"""
+
+import asyncio
+
+from backend.managers import DraftManager, ExpenseManager
+
+
+def _expense(date: str, description: str) -> dict:
+    return {'date': date, 'amount': 1.0, 'currency': 'EUR', 'fx_rate': 1.0, 'amount_eur': 1.0,
+            'description': description, 'category': 'Other', 'person': 'A', 'beneficiary': ''}
+
+
+def test_expense_pages_cover_every_row_in_order(with_pool):
+    async def body(pool):
+        manager = ExpenseManager(pool)
+        for i, date in enumerate(['2024-01-02', '2024-01-01', '2024-01-02', '2024-01-03',
+                                  '2024-01-02', '2024-01-01', '2024-01-02']):
+            await manager.create_expense(_expense(date, f'e{i}'))
+        return [page async for page in manager.iter_expense_pages(page_size=3)]
+    
+    pages = with_pool(body)
+    
+    assert [len(page) for page in pages] == [3, 3, 1]
+    listed = [(e['date'], e['id']) for page in pages for e in page]
+    assert listed == sorted(listed, reverse=True) and len(set(listed)) == 7
+
+
+def test_expense_pages_empty_table(with_pool):
+    async def body(pool):
+        return [page async for page in ExpenseManager(pool).iter_expense_pages()]
+    
+    assert with_pool(body) == []
+
+
+def _confirm_items(drafts, bad=()):
+    return {
+        draft_id: (dict(_expense('2024-05-01', f'd{draft_id}'), amount='oops' if draft_id in bad else 2.0),
+                   draft['image_sha256'], draft['image_filename'])
+        for draft_id, draft in drafts.items()
+    }
+
+
+async def _save_drafts(pool, count: int):
+    draft_manager = DraftManager(pool)
+    draft_ids = await draft_manager.save_drafts_bulk(
+        'group', [_expense('2024-05-01', f'draft {i}') for i in range(count)], b'\x89PNG image', 'r.png'
+    )
+    return draft_manager, await draft_manager.get_drafts_many(draft_ids)
+
+
+def test_confirm_drafts_flags_only_failing_rows(with_pool):
+    async def body(pool):
+        draft_manager, drafts = await _save_drafts(pool, 3)
+        bad = list(drafts)[1]
+        confirmed, errors = await ExpenseManager(pool).confirm_drafts(_confirm_items(drafts, bad={bad}))
+        remaining = [d['id'] for d in await draft_manager.get_all_drafts()]
+        expenses = await ExpenseManager(pool).get_all_expenses()
+        return drafts, bad, confirmed, errors, remaining, expenses
+    
+    drafts, bad, confirmed, errors, remaining, expenses = with_pool(body)
+    
+    assert confirmed == [d for d in drafts if d != bad] and list(errors) == [bad]
+    assert remaining == [bad]
+    assert len(expenses) == 2 and all(e['has_image'] for e in expenses)
+
+
+def test_confirm_drafts_never_duplicates(with_pool):
+    async def body(pool):
+        _, drafts = await _save_drafts(pool, 4)
+        manager = ExpenseManager(pool)
+        items = _confirm_items(drafts)
+        first, second = await asyncio.gather(manager.confirm_drafts(items), manager.confirm_drafts(items))
+        again = await manager.confirm_drafts(items)
+        audit = [await manager.get_expense_audit_history(e['id']) for e in await manager.get_all_expenses()]
+        return drafts, first, second, again, audit
+    
+    drafts, first, second, again, audit = with_pool(body)
+    
+    assert sorted(first[0] + second[0]) == sorted(drafts)
+    assert again == ([], {draft_id: 'Draft no longer exists' for draft_id in drafts})
+    assert len(audit) == 4 and all([a['operation'] for a in entries] == ['INSERT'] for entries in audit)
@@ -0,0 +1,114 @@
+"""
+Expense Tracker - Schema Migration Tests
+
+PURPOSE: Regression tests for upgrading legacy databases to the current schema
+SCOPE: DatabaseManager.initialize_database on pre-v1 and partially migrated files
+DEPENDENCIES: pytest, backend.database, backend.managers
+"""
+
+import asyncio
+import sqlite3
+
+from backend.database import DatabaseManager, SqlitePool
+from backend.managers import ExpenseManager
+
+LEGACY_FULL_COLUMNS = '''
+    CREATE TABLE expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, amount REAL NOT NULL,
+        currency TEXT, fx_rate REAL, amount_eur REAL, description TEXT, category TEXT,
+        person TEXT, beneficiary TEXT, image_data BLOB, image_filename TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _seed(path, script: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(script)
+    conn.commit()
+    conn.close()
+
+
+def _upgrade(path):
+    """Run the migrations, then return every expense as the API would list it."""
+    async def run():
+        pool = SqlitePool(str(path), readers=1)
+        await pool.open()
+        try:
+            await DatabaseManager(pool).initialize_database()
+            return await ExpenseManager(pool).get_all_expenses()
+        finally:
+            await pool.close()
+    return asyncio.run(run())
+
+
+def _user_version(path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_rebuild_path_fills_missing_columns(tmp_path):
+    db = tmp_path / 'legacy.db'
+    _seed(db, '''
+        CREATE TABLE expenses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, amount REAL NOT NULL,
+            currency TEXT, description TEXT, category TEXT, person TEXT, image_data BLOB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO expenses (date, amount, currency, description, category, person, created_at)
+        VALUES ('2024-01-02', 5, 'EUR', 'Lunch', 'Food', 'A', '2024-01-02 10:00:00');
+        INSERT INTO expenses (date, amount, currency, description, category, person)
+        VALUES ('2024-01-03', 6, 'USD', NULL, NULL, 'B');
+    ''')
+    
+    expenses = {e['id']: e for e in _upgrade(db)}
+    
+    assert _user_version(db) == DatabaseManager.SCHEMA_VERSION
+    assert expenses[1]['fx_rate'] == 1.0 and expenses[1]['amount_eur'] == 5.0
+    assert expenses[1]['created_on'] == '2024-01-02 10:00:00'
+    assert expenses[2]['description'] == 'Imported Expense' and expenses[2]['category'] == 'Other'
+
+
+def test_in_place_path_backfills_null_legacy_columns(tmp_path):
+    db = tmp_path / 'nulls.db'
+    _seed(db, LEGACY_FULL_COLUMNS + ''';
+        INSERT INTO expenses (date, amount, currency, fx_rate, amount_eur, description, category,
+                              person, beneficiary, image_filename, created_at)
+        VALUES ('2024-02-01', 7.5, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, '2024-02-01 08:30:00');
+    ''')
+    
+    [expense] = _upgrade(db)
+    
+    assert expense['currency'] == 'EUR' and expense['fx_rate'] == 1.0 and expense['amount_eur'] == 7.5
+    assert expense['description'] == 'Imported Expense' and expense['category'] == 'Other'
+    assert expense['person'] == '' and expense['beneficiary'] == ''
+    assert expense['created_on'] == expense['modified_on'] == '2024-02-01 08:30:00'
+
+
+def test_in_place_path_moves_inline_images(tmp_path):
+    db = tmp_path / 'images.db'
+    _seed(db, LEGACY_FULL_COLUMNS + ''';
+        INSERT INTO expenses (date, amount, currency, fx_rate, amount_eur, description, category,
+                              person, beneficiary, image_data, image_filename)
+        VALUES ('2024-03-01', 3, 'EUR', 1.0, 3, 'Coffee', 'Caffeine', 'A', '', X'89504E47', 'a.png');
+    ''')
+    
+    [expense] = _upgrade(db)
+    
+    assert expense['has_image']
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute('SELECT image_data FROM expenses').fetchone()[0] is None
+        assert conn.execute('SELECT data, filename FROM images').fetchall() == [(b'\x89PNG', 'a.png')]
+    finally:
+        conn.close()
+
+
+def test_current_database_is_left_alone(tmp_path):
+    db = tmp_path / 'fresh.db'
+    assert _upgrade(db) == []
+    assert _upgrade(db) == []
+    assert _user_version(db) == DatabaseManager.SCHEMA_VERSION
@@ -0,0 +1,44 @@
+"""
+Expense Tracker - Parser Tests
+
+PURPOSE: Regression tests for reading month-name dates from OCR text
+SCOPE: _month_date and the ABN AMRO parsers that use it
+DEPENDENCIES: pytest, backend.parsers
+"""
+
+import pytest
+
+from backend.parsers import ABNAmroListParser, ABNAmroSingleParser, _month_date
+
+
+@pytest.mark.parametrize('day, month, year, expected', [
+    ('29', 'May', '2025', '2025-05-29'),
+    ('3', 'juni', '2024', '2024-06-03'),
+    ('1', 'MAART', '2024', '2024-03-01'),
+    ('29', 'february', '2024', '2024-02-29'),
+])
+def test_month_date_reads_english_and_dutch(day, month, year, expected):
+    assert _month_date(day, month, year) == expected
+
+
+@pytest.mark.parametrize('day, month, year', [
+    ('31', 'february', '2024'), ('29', 'Mayo', '2025'), ('x', 'May', '2025'), ('123', 'May', '2025'), ('1', 'May', '25'),
+])
+def test_month_date_rejects_invalid_dates(day, month, year):
+    assert _month_date(day, month, year) is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Execution\n Thursday 29 May 2025', '2025-05-29'),
+    ('Paid on Monday 3 June 2024', '2024-06-03'),
+    ('Betaald 3 juni 2024 bij winkel', '2024-06-03'),
+    ('No date here', None),
+])
+def test_single_parser_extracts_dates(text, expected):
+    assert ABNAmroSingleParser()._extract_date(text) == expected
+
+
+def test_list_parser_dates_rows_from_weekday_header():
+    rows = ABNAmroListParser().parse('Donderdag 29 mei 2025\nAlbert Heijn -12,50\nHEMA -3,20')
+    
+    assert [(row['date'], row['amount']) for row in rows] == [('2025-05-29', 12.5), ('2025-05-29', 3.2)]
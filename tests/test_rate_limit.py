@@ -0,0 +1,49 @@
+"""
+Expense Tracker - Rate Limiter Tests
+
+PURPOSE: Regression tests for per-client token buckets
+SCOPE: TokenBucketLimiter with a controlled clock
+DEPENDENCIES: pytest, backend.rate_limit
+"""
+
+import pytest
+
+from backend import rate_limit
+from backend.rate_limit import TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_bucket_empties_then_refills(clock):
+    limiter = TokenBucketLimiter(rate=2, period=60)
+    
+    assert limiter.consume('a') and limiter.consume('a')
+    assert not limiter.consume('a')
+    assert limiter.retry_after('a') == 31
+    
+    clock[0] += 30
+    assert limiter.consume('a') and not limiter.consume('a')
+
+
+def test_clients_have_separate_buckets(clock):
+    limiter = TokenBucketLimiter(rate=1, period=60)
+    
+    assert limiter.consume('a') and not limiter.consume('a')
+    assert limiter.consume('b')
+    assert limiter.retry_after('b') > 0 and limiter.retry_after('c') == 0
+
+
+def test_idle_clients_are_forgotten(clock, monkeypatch):
+    monkeypatch.setattr(TokenBucketLimiter, 'MAX_TRACKED_CLIENTS', 2)
+    limiter = TokenBucketLimiter(rate=1, period=60)
+    limiter.consume('idle')
+    clock[0] += 60
+    limiter.consume('busy')
+    limiter.consume('new')
+    
+    assert set(limiter._buckets) == {'busy', 'new'}
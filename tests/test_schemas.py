@@ -0,0 +1,48 @@
+"""
+Expense Tracker - Request Schema Tests
+
+PURPOSE: Regression tests for parsing expense forms through ExpenseForm
+SCOPE: The as_form dependency against a minimal FastAPI app
+DEPENDENCIES: pytest, fastapi, backend.schemas
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.schemas import DESCRIPTION_MAX_LENGTH, ExpenseForm, as_form
+
+app = FastAPI()
+
+
+@app.post('/expense')
+def submit(form: ExpenseForm = Depends(as_form(ExpenseForm))):
+    return form.model_dump()
+
+
+FORM = {'date': '2024-05-01', 'amount': '12.5', 'currency': 'EUR', 'fx_rate': '1', 'amount_eur': '12.5',
+        'description': '  Groceries  ', 'category': 'Food', 'person': 'A'}
+
+
+def test_form_is_parsed_and_stripped():
+    response = TestClient(app).post('/expense', data=FORM)
+    
+    assert response.status_code == 200
+    assert response.json()['description'] == 'Groceries' and response.json()['beneficiary'] == ''
+
+
+@pytest.mark.parametrize('field, value', [
+    ('fx_rate', '0'), ('currency', 'GBP'), ('description', 'x' * (DESCRIPTION_MAX_LENGTH + 1)), ('amount', 'abc'),
+])
+def test_model_constraints_are_a_422(field, value):
+    response = TestClient(app).post('/expense', data={**FORM, field: value})
+    
+    assert response.status_code == 422
+    assert response.json()['detail'][0]['loc'] == ['body', field]
+
+
+def test_missing_field_is_a_422():
+    form = dict(FORM)
+    del form['person']
+    
+    assert TestClient(app).post('/expense', data=form).status_code == 422